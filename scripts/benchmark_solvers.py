@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+from scripts.verify_solvers import is_correct  # noqa: E402
+from services.common.solvers import (  # noqa: E402
+    classify_prompt,
+    get_byte_programs,
+    parse_puzzle,
+    solve_bits,
+    solve_equations,
+    solve_numeral,
+    solve_physics,
+    solve_text,
+    solve_unit,
+)
+
+SOLVERS = {
+    "physics": solve_physics,
+    "numeral": solve_numeral,
+    "unit": solve_unit,
+    "text": solve_text,
+    "equations": solve_equations,
+    "bits": solve_bits,
+}
+# Latency percentiles compared against the baseline.
+CHECKED = ("p50_ms", "p95_ms")
+
+
+def sample_prompts(train_path, samples, seed):
+    """Up to ``samples`` (prompt, answer) rows per solver category."""
+    df = pd.read_csv(train_path, dtype=str)
+    df["category"] = df["prompt"].map(classify_prompt)
+    df = df[df["category"].notna()]
+    return {
+        category: group.sample(min(samples, len(group)), random_state=seed)
+        for category, group in df.groupby("category")
+    }
+
+
+def benchmark_category(solver, rows):
+    # Parsing and solving are timed together, uncached and without a time
+    # budget; peak memory comes from a second, traced pass so tracing does
+    # not skew the latencies.
+    prompts, answers = rows["prompt"].tolist(), rows["answer"].tolist()
+    latencies, correct = [], 0
+    for prompt, expected in zip(prompts, answers):
+        start = time.perf_counter()
+        answer = solver(parse_puzzle(prompt))
+        latencies.append(time.perf_counter() - start)
+        correct += is_correct(expected, answer)
+
+    tracemalloc.start()
+    for prompt in prompts:
+        solver(parse_puzzle(prompt))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "samples": len(prompts),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "throughput_per_s": round(len(prompts) / max(sum(latencies), 1e-9), 1),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "accuracy": round(correct / len(prompts), 4),
+    }
+
+
+def find_regressions(results, baseline, tolerance, slack_ms):
+    """Human-readable regressions of ``results`` against ``baseline``.
+
+    A latency regresses when it exceeds the baseline by more than
+    ``tolerance`` (a fraction) and by more than ``slack_ms``, so timer noise
+    on sub-millisecond categories does not fail the run.
+    """
+    regressions = []
+    for category, stats in results.items():
+        previous = baseline.get(category)
+        if not previous:
+            continue
+        for key in CHECKED:
+            limit = max(previous[key] * (1 + tolerance), previous[key] + slack_ms)
+            if stats[key] > limit:
+                regressions.append(
+                    f"{category} {key}: {stats[key]:.3f} > {limit:.3f} "
+                    f"(baseline {previous[key]:.3f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Wonderland solvers per puzzle category."
+    )
+    parser.add_argument(
+        "--train",
+        default=os.path.join(project_root, "data", "nemotron", "train.csv"),
+        help="Nemotron train.csv to sample prompts from.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=os.path.join(project_root, "benchmarks", "solver_baseline.json"),
+        help="JSON baseline to compare against (and write with --update).",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=100, help="Prompts sampled per category."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed fractional slowdown of p50/p95 before the run fails.",
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=0.5,
+        help="Absolute slowdown in milliseconds always tolerated.",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="Write the results as the baseline."
+    )
+    args = parser.parse_args()
+
+    rows = sample_prompts(args.train, args.samples, args.seed)
+    # Build shared tables and warm each solver up before anything is timed.
+    get_byte_programs()
+    for category, group in rows.items():
+        SOLVERS[category](parse_puzzle(group["prompt"].iloc[0]))
+
+    results = {}
+    for category in sorted(rows):
+        results[category] = benchmark_category(SOLVERS[category], rows[category])
+        stats = results[category]
+        print(
+            f"{category:<10} n={stats['samples']:<4} p50={stats['p50_ms']:.2f}ms "
+            f"p95={stats['p95_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms "
+            f"{stats['throughput_per_s']:.0f}/s peak={stats['peak_memory_kb']:.0f}KB "
+            f"acc={stats['accuracy']:.2%}"
+        )
+
+    report = {"samples": args.samples, "seed": args.seed, "categories": results}
+    if args.update:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Wrote baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}; run with --update to create one.")
+    with open(args.baseline) as f:
+        baseline = json.load(f)["categories"]
+    regressions = find_regressions(results, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print("Solver latency regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No category slowed down by more than {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from peft import LoraConfig, TaskType
 
 # Add project root to path
 sys.path.insert(0, os.getcwd())
-from services.common.solvers import get_boxed_answer  # noqa: E402
+from services.common.solvers import box_answer, solve_batch  # noqa: E402
 
 
 def train():
@@ -28,8 +28,9 @@ def train():
 
     subset = df.head(10000)
     solved = 0
-    for _, row in subset.iterrows():
-        ans = get_boxed_answer(row["prompt"])
+    answers = solve_batch(subset["prompt"].tolist(), lazy=True)
+    for ans, (_, row) in zip(answers, subset.iterrows()):
+        ans = box_answer(ans)
         if ans:
             solved += 1
             # Generate more descriptive CoT (wrapped to avoid E501)
@@ -1,42 +1,190 @@
+import argparse
+import json
 import os
+import shutil
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+import numpy as np
 import pandas as pd
 
-sys.path.insert(0, os.getcwd())
-from services.common.solvers import wonderland_solver  # noqa: E402
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+from services.common import config  # noqa: E402
+from services.common.solvers import (  # noqa: E402
+    SOLVER_VERSION,
+    classify_prompt,
+    solve_uncached,
+)
+
+NEMOTRON_DIR = os.path.join(project_root, "data", "nemotron")
+
+
+def is_correct(expected, actual):
+    # Competition metric: exact string match or a numerical tolerance.
+    if actual is None:
+        return False
+    try:
+        if abs(float(actual) - float(expected)) < 0.1:
+            return True
+    except ValueError:
+        pass
+    return str(actual).strip() == str(expected).strip()
+
+
+def check_rows(rows):
+    """Solve ``(id, prompt, expected)`` rows; one result dict per row."""
+    results = []
+    for row_id, prompt, expected in rows:
+        start = time.perf_counter()
+        actual, status = solve_uncached(prompt)
+        latency = time.perf_counter() - start
+        results.append(
+            {
+                "id": row_id,
+                "category": classify_prompt(prompt) or "unknown",
+                "correct": is_correct(expected, actual),
+                "latency_ms": round(latency * 1000, 3),
+                "expected": expected,
+                "actual": actual,
+                "status": status,
+            }
+        )
+    return results
+
+
+def run_shard(index, rows, checkpoint_dir):
+    """Verify one shard and checkpoint its results atomically."""
+    results = check_rows(rows)
+    path = os.path.join(checkpoint_dir, f"shard-{index:05d}.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(results, f)
+    os.replace(path + ".tmp", path)
+    return index, len(results)
+
+
+def prepare_checkpoints(checkpoint_dir, manifest, fresh):
+    # Checkpoints only resume a run over the same data, sharding and solver
+    # version; anything else starts over.
+    manifest_path = os.path.join(checkpoint_dir, "manifest.json")
+    if not fresh and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f) == manifest:
+                return
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    os.makedirs(checkpoint_dir)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+
+def replay_failures(path):
+    """Re-check a failure corpus before the sweep; prints how many now pass."""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        failures = [json.loads(line) for line in f if line.strip()]
+    if not failures:
+        return
+    results = check_rows((r["id"], r["prompt"], r["expected"]) for r in failures)
+    fixed = sum(r["correct"] for r in results)
+    print(f"Replayed {len(failures)} known failures: {fixed} now pass.")
+
+
+def write_failures(path, results, prompts):
+    with open(path, "w") as f:
+        for r in results:
+            if not r["correct"]:
+                record = {
+                    "id": r["id"],
+                    "category": r["category"],
+                    "prompt": prompts[r["id"]],
+                    "expected": r["expected"],
+                    "actual": r["actual"],
+                    "status": r["status"],
+                }
+                f.write(json.dumps(record) + "\n")
+
+
+def report(results):
+    df = pd.DataFrame(results)
+    print(f"Verified {len(df)} samples.")
+    print(f"Correct: {int(df['correct'].sum())}")
+    if len(df):
+        print(f"Total System Accuracy: {df['correct'].mean():.2%}")
+    for category, group in df.groupby("category"):
+        latencies = group["latency_ms"].to_numpy()
+        print(
+            f"  {category:<10} n={len(group):<5} acc={group['correct'].mean():.2%} "
+            f"p50={np.percentile(latencies, 50):.2f}ms "
+            f"p95={np.percentile(latencies, 95):.2f}ms "
+            f"max={latencies.max():.2f}ms"
+        )
 
 
 def verify():
-    df = pd.read_csv("data/nemotron/train.csv")
-    correct = 0
-    total = 0
-
-    # Check 1000 samples
-    samples = df.head(2000)
-    for idx, row in samples.iterrows():
-        ans = wonderland_solver(row["prompt"])
-        total += 1
-        if not ans:
-            continue
-
-        # Competition metric: matches ground truth exactly as string or relative numerical tolerance
-        try:
-            exp_f = float(row["answer"])
-            act_f = float(ans)
-            if abs(act_f - exp_f) < 0.1:
-                correct += 1
-                continue
-        except Exception:
-            pass
-
-        if str(ans).strip() == str(row["answer"]).strip():
-            correct += 1
-
-    print(f"Verified {total} samples.")
-    print(f"Correct: {correct}")
-    if total > 0:
-        print(f"Total System Accuracy: {correct/total:.2%}")
+    parser = argparse.ArgumentParser(
+        description="Sharded accuracy sweep of the Wonderland solvers."
+    )
+    parser.add_argument("--train", default=os.path.join(NEMOTRON_DIR, "train.csv"))
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Only check the first N rows."
+    )
+    parser.add_argument("--shard-size", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=config.SOLVER_WORKERS)
+    parser.add_argument(
+        "--checkpoint-dir", default=os.path.join(NEMOTRON_DIR, "verify_checkpoints")
+    )
+    parser.add_argument(
+        "--failures",
+        default=os.path.join(NEMOTRON_DIR, "solver_failures.jsonl"),
+        help="Failure corpus, replayed first and rewritten after the sweep.",
+    )
+    parser.add_argument(
+        "--fresh", action="store_true", help="Ignore existing checkpoints."
+    )
+    args = parser.parse_args()
+
+    replay_failures(args.failures)
+
+    df = pd.read_csv(args.train, dtype=str)
+    if args.limit:
+        df = df.head(args.limit)
+    rows = list(df[["id", "prompt", "answer"]].itertuples(index=False, name=None))
+    shards = []
+    for start in range(0, len(rows), args.shard_size):
+        stop = start + args.shard_size
+        shards.append(rows[start:stop])
+    manifest = {
+        "train": os.path.abspath(args.train),
+        "rows": len(rows),
+        "shard_size": args.shard_size,
+        "solver_version": SOLVER_VERSION,
+    }
+    prepare_checkpoints(args.checkpoint_dir, manifest, args.fresh)
+
+    def checkpoint(index):
+        return os.path.join(args.checkpoint_dir, f"shard-{index:05d}.json")
+
+    pending = [i for i in range(len(shards)) if not os.path.exists(checkpoint(i))]
+    if len(pending) < len(shards):
+        print(f"Resuming: {len(shards) - len(pending)}/{len(shards)} shards done.")
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        futures = [
+            pool.submit(run_shard, i, shards[i], args.checkpoint_dir) for i in pending
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            index, count = future.result()
+            print(f"Shard {index} ({count} rows) done [{done}/{len(pending)}]")
+
+    results = []
+    for index in range(len(shards)):
+        with open(checkpoint(index)) as f:
+            results.extend(json.load(f))
+    prompts = dict(zip(df["id"], df["prompt"]))
+    write_failures(args.failures, results, prompts)
+    report(results)
 
 
 if __name__ == "__main__":
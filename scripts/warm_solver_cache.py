@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+from services.common import config  # noqa: E402
+from services.common.solvers import warm_solver_cache  # noqa: E402
+
+
+def warm():
+    if not config.SOLVER_CACHE_PATH:
+        print("SOLVER_CACHE_PATH is not set; nothing would persist.")
+        return
+
+    df = pd.read_csv("data/nemotron/train.csv")
+    solved = warm_solver_cache(df["prompt"].tolist())
+    print(f"Cached {len(df)} prompts ({solved} solved) in {config.SOLVER_CACHE_PATH}.")
+
+
+if __name__ == "__main__":
+    warm()
@@ -0,0 +1,123 @@
+import asyncio
+from collections import deque
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from services.common import config, metrics
+
+# Probes are answered even when the service is saturated.
+_UNBOUNDED_PATHS = frozenset({"/health", "/ready"})
+
+
+class _Route:
+    __slots__ = ("limit", "in_flight", "waiters")
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters = deque()
+
+
+class AdmissionController:
+    """Caps the requests each route of a service works on at once.
+
+    A route runs at most ``max_in_flight`` requests (``routes`` overrides it
+    per path). Beyond that, up to ``max_queue`` requests wait in FIFO order
+    for at most ``queue_timeout_ms``; a finishing request hands its slot
+    straight to the oldest waiter. Anything else is shed at once with a 503
+    and a ``Retry-After`` of ``retry_after`` seconds, so a burst fails fast
+    instead of piling onto the event loop. In-flight and queued counts are
+    exported per route as gauges, and shed requests are counted.
+    """
+
+    def __init__(
+        self,
+        service,
+        max_in_flight=None,
+        max_queue=None,
+        queue_timeout_ms=None,
+        routes=None,
+        retry_after=None,
+    ):
+        if queue_timeout_ms is None:
+            queue_timeout_ms = config.ADMISSION_QUEUE_TIMEOUT_MS
+        self.service = service
+        self.max_in_flight = max_in_flight or config.ADMISSION_MAX_IN_FLIGHT
+        self.max_queue = config.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.route_limits = config.ADMISSION_ROUTE_LIMITS if routes is None else routes
+        self.retry_after = retry_after or config.ADMISSION_RETRY_AFTER_SECONDS
+        self._routes = {}
+
+    def _route(self, path):
+        route = self._routes.get(path)
+        if route is None:
+            route = _Route(int(self.route_limits.get(path, self.max_in_flight)))
+            self._routes[path] = route
+        return route
+
+    def _publish(self, path, route):
+        metrics.set_admission_state(
+            self.service, path, route.in_flight, len(route.waiters)
+        )
+
+    async def acquire(self, path):
+        """Take a slot on ``path``; False if the request should be shed."""
+        route = self._route(path)
+        if route.in_flight < route.limit and not route.waiters:
+            route.in_flight += 1
+            self._publish(path, route)
+            return True
+        if len(route.waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        route.waiters.append(waiter)
+        self._publish(path, route)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # The client went away; pass on a slot handed over meanwhile.
+            if waiter.done():
+                self.release(path)
+            else:
+                self._abandon(path, route, waiter)
+            raise
+        if waiter.done():
+            return True
+        self._abandon(path, route, waiter)
+        return False
+
+    def _abandon(self, path, route, waiter):
+        waiter.cancel()
+        route.waiters.remove(waiter)
+        self._publish(path, route)
+
+    def release(self, path):
+        route = self._routes[path]
+        while route.waiters:
+            waiter = route.waiters.popleft()
+            if not waiter.done():
+                # The slot passes to the waiter; in_flight is unchanged.
+                waiter.set_result(None)
+                break
+        else:
+            route.in_flight -= 1
+        self._publish(path, route)
+
+    async def middleware(self, request: Request, call_next):
+        path = request.url.path
+        if path in _UNBOUNDED_PATHS:
+            return await call_next(request)
+        if not await self.acquire(path):
+            metrics.record_admission_shed(self.service, path)
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Service is at capacity; retry shortly."},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        try:
+            return await call_next(request)
+        finally:
+            self.release(path)
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+
+import mlflow
+
+from services.common import config, metrics
+
+logger = logging.getLogger("artifact_cache")
+
+_CHECKSUM_FILE = "SHA256"
+_MODEL_DIR = "model"
+
+
+def tree_checksum(path):
+    """SHA-256 over the relative paths and contents of every file in ``path``."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).encode())
+            digest.update(b"\0")
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def _tree_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+class ModelArtifactCache:
+    """On-disk cache of registered model artifacts, shared by a node's services.
+
+    Entries live under ``root`` keyed by the model version's run ID and
+    artifact source, so a version is downloaded once and every later load
+    on the node reads it from local disk. Each entry stores the SHA-256 of
+    its files, checked on every hit; a corrupt entry is discarded and
+    downloaded again. Downloads land in a temporary directory and are
+    renamed into place, so concurrent loaders in different processes never
+    see a partial entry. Entries are evicted least recently used first once
+    the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root, max_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def entry_key(model_version):
+        source = hashlib.sha256(model_version.source.encode()).hexdigest()[:16]
+        return f"{model_version.run_id}-{source}"
+
+    def _verified(self, entry):
+        try:
+            with open(os.path.join(entry, _CHECKSUM_FILE)) as f:
+                expected = f.read().strip()
+        except OSError:
+            return False
+        return tree_checksum(os.path.join(entry, _MODEL_DIR)) == expected
+
+    def fetch(self, model_name, model_version):
+        """Local path of ``model_version``'s artifacts, downloading on a miss."""
+        entry = os.path.join(self.root, self.entry_key(model_version))
+        if os.path.isdir(entry):
+            if self._verified(entry):
+                metrics.record_model_cache("hit")
+                os.utime(os.path.join(entry, _CHECKSUM_FILE))
+                return os.path.join(entry, _MODEL_DIR)
+            logger.warning(f"Model cache entry {entry} failed its checksum.")
+            metrics.record_model_cache("corrupt")
+            shutil.rmtree(entry, ignore_errors=True)
+
+        metrics.record_model_cache("miss")
+        staging = tempfile.mkdtemp(prefix=".download-", dir=self.root)
+        try:
+            # A models:/ URI downloads the model's files straight into dst_path.
+            model_dir = os.path.join(staging, _MODEL_DIR)
+            os.makedirs(model_dir)
+            mlflow.artifacts.download_artifacts(
+                artifact_uri=f"models:/{model_name}/{model_version.version}",
+                dst_path=model_dir,
+            )
+            with open(os.path.join(staging, _CHECKSUM_FILE), "w") as f:
+                f.write(tree_checksum(model_dir))
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another process finished the same download first.
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=entry)
+        return os.path.join(entry, _MODEL_DIR)
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.root):
+                entry = os.path.join(self.root, name)
+                checksum = os.path.join(entry, _CHECKSUM_FILE)
+                if name.startswith(".") or not os.path.exists(checksum):
+                    continue
+                entries.append((os.path.getmtime(checksum), entry, _tree_size(entry)))
+            total = sum(size for _, _, size in entries)
+            for _, entry, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if entry == keep:
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                metrics.record_model_cache("evict")
+                total -= size
+
+    def load(self, model_name, version=None):
+        """Load ``model_name`` at ``version``, or its ``@production`` alias."""
+        client = mlflow.tracking.MlflowClient()
+        if version is None:
+            model_version = client.get_model_version_by_alias(model_name, "production")
+        else:
+            model_version = client.get_model_version(model_name, str(version))
+        return mlflow.pyfunc.load_model(self.fetch(model_name, model_version))
+
+
+@lru_cache(maxsize=None)
+def get_artifact_cache():
+    """The node's artifact cache, or None when ``MODEL_CACHE_DIR`` is unset."""
+    if not config.MODEL_CACHE_DIR:
+        return None
+    return ModelArtifactCache(config.MODEL_CACHE_DIR, config.MODEL_CACHE_MAX_BYTES)
+
+
+def load_model(model_name, version=None):
+    """The pyfunc model for ``model_name`` at ``version`` (default: production).
+
+    Goes through the local artifact cache when one is configured, and
+    straight to the registry otherwise.
+    """
+    cache = get_artifact_cache()
+    if cache is not None:
+        return cache.load(model_name, version)
+    if version is None:
+        return mlflow.pyfunc.load_model(f"models:/{model_name}@production")
+    return mlflow.pyfunc.load_model(f"models:/{model_name}/{version}")
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+
+from services.common import config, metrics
+from services.common.mlp_kernel import predict_rows
+
+logger = logging.getLogger("batching")
+
+
+class MicroBatcher:
+    """Merges concurrent single-item calls into batched ``run_batch`` calls.
+
+    Callers :meth:`submit` one item and await its result. A background task
+    takes the oldest waiting item, drains whatever else is queued and, while
+    the batch is below ``max_batch_size``, waits up to ``max_wait_ms`` for
+    more, then hands the batch to ``run_batch`` (an async callable mapping a
+    list of items to a list of results) and resolves each caller with its
+    own result. The wait is adaptive: after a batch of one, a lone request
+    is flushed at once, so light traffic pays no added latency.
+    """
+
+    def __init__(self, service, name, run_batch, max_batch_size=None, max_wait_ms=None):
+        if max_wait_ms is None:
+            max_wait_ms = config.MICROBATCH_MAX_WAIT_MS
+        self.service = service
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size or config.MICROBATCH_MAX_SIZE
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._worker = None
+        self._last_batch_size = 0
+
+    async def submit(self, item):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        metrics.set_microbatch_queue_depth(self.service, self.name, depth)
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if len(batch) == 1 and self._last_batch_size <= 1:
+            return batch
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self._last_batch_size = len(batch)
+            started = time.perf_counter()
+            metrics.observe_microbatch(
+                self.service,
+                self.name,
+                len(batch),
+                [started - queued for _, _, queued in batch],
+                self._queue.qsize(),
+            )
+            try:
+                results = await self.run_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(
+                        f"Batch of {len(batch)} items returned {len(results)} results"
+                    )
+            except Exception as e:
+                logger.error(f"Micro-batch for '{self.name}' failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+class ModelBatchers:
+    """One :class:`MicroBatcher` per task over the tabular models in ``models``.
+
+    ``models`` is the service's live ``task_id -> model`` mapping; the model
+    is looked up when each batch runs, and the batch's rows go to a single
+    :func:`predict_rows` call on ``executors``.
+    """
+
+    def __init__(self, service, models, executors):
+        self.service = service
+        self.models = models
+        self.executors = executors
+        self._batchers = {}
+
+    def _runner(self, task_id):
+        feature_names = config.get_task_config(task_id)["feature_names"]
+
+        async def run_batch(rows):
+            model = self.models[task_id]
+            probabilities = await self.executors.infer(
+                task_id, predict_rows, model, rows, feature_names
+            )
+            return [float(p) for p in probabilities]
+
+        return run_batch
+
+    async def predict(self, task_id, row):
+        """Probability of class A for one feature row of ``task_id``."""
+        batcher = self._batchers.get(task_id)
+        if batcher is None:
+            batcher = MicroBatcher(self.service, task_id, self._runner(task_id))
+            self._batchers[task_id] = batcher
+        return await batcher.submit(row)
+
+    async def close(self):
+        for batcher in self._batchers.values():
+            await batcher.close()
+        self._batchers.clear()
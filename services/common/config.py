@@ -24,6 +24,89 @@ EVALUATOR_LOOP_TIMEOUT_SECONDS = float(
     os.getenv("EVALUATOR_LOOP_TIMEOUT_SECONDS", 30.0)
 )
 
+# Solvers
+# Optional .npz cache for the precomputed whole-byte program library.
+BYTE_PROGRAMS_CACHE_PATH = os.getenv("BYTE_PROGRAMS_CACHE_PATH")
+# Hard time budget for the symbol-to-digit equation search, per prompt.
+CRYPTARITHM_TIME_BUDGET_SECONDS = float(
+    os.getenv("CRYPTARITHM_TIME_BUDGET_SECONDS", 0.05)
+)
+# Process pool size and chunk size for solve_batch.
+SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", os.cpu_count() or 1))
+SOLVER_BATCH_CHUNKSIZE = int(os.getenv("SOLVER_BATCH_CHUNKSIZE", 64))
+# Result cache: in-process LRU entries and an optional SQLite store path.
+SOLVER_CACHE_SIZE = int(os.getenv("SOLVER_CACHE_SIZE", 4096))
+SOLVER_CACHE_PATH = os.getenv("SOLVER_CACHE_PATH")
+# Wall-clock budget for one solve, per category; SOLVER_TIME_BUDGET_<CATEGORY>
+# overrides the default for a single category.
+SOLVER_TIME_BUDGET_SECONDS = float(os.getenv("SOLVER_TIME_BUDGET_SECONDS", 1.0))
+SOLVER_TIME_BUDGETS = {
+    category: float(
+        os.getenv(f"SOLVER_TIME_BUDGET_{category.upper()}", SOLVER_TIME_BUDGET_SECONDS)
+    )
+    for category in ("physics", "numeral", "unit", "text", "equations", "bits")
+}
+# Opt-in per-stage solver metrics (timings, candidates, hits).
+SOLVER_TRACING = os.getenv("SOLVER_TRACING", "false").lower() == "true"
+
+# Executors keeping solver work and model inference off the event loop,
+# one per task. SOLVER_EXECUTOR is "process" or "thread".
+SOLVER_EXECUTOR = os.getenv("SOLVER_EXECUTOR", "process")
+SOLVER_EXECUTOR_WORKERS = int(os.getenv("SOLVER_EXECUTOR_WORKERS", 2))
+INFERENCE_EXECUTOR_WORKERS = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", 4))
+# Server-side micro-batching of concurrent single-row model predictions.
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "true").lower() == "true"
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", 32))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", 5))
+# Model loading: "eager" loads every task at startup, "lazy" on first use.
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "eager")
+MODEL_LOAD_ATTEMPTS = int(os.getenv("MODEL_LOAD_ATTEMPTS", 5))
+MODEL_LOAD_BACKOFF_SECONDS = float(os.getenv("MODEL_LOAD_BACKOFF_SECONDS", 1.0))
+MODEL_LOAD_BACKOFF_MAX_SECONDS = float(os.getenv("MODEL_LOAD_BACKOFF_MAX_SECONDS", 8.0))
+# Shared on-disk cache of model artifacts (unset: always download) and its
+# size cap in bytes.
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR")
+MODEL_CACHE_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_BYTES", 2 * 1024**3))
+# Warm-up before a pod reports ready: synthetic rows per warm-up batch for
+# each tabular model (0 disables) and a solver pass in each solver pool.
+MODEL_WARMUP_ROWS = int(os.getenv("MODEL_WARMUP_ROWS", MICROBATCH_MAX_SIZE))
+SOLVER_WARMUP = os.getenv("SOLVER_WARMUP", "true").lower() == "true"
+# Worker processes forked per proposer/critic pod after loading models once.
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", 1))
+# Seconds between checks of each model's @production alias; 0 disables reload.
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", 30))
+
+
+def _overrides(name):
+    # "key=value,key=value", e.g. "/predict=6000/minute,/update=600/minute".
+    pairs = (item.split("=", 1) for item in os.getenv(name, "").split(",") if item)
+    return {key.strip(): rate.strip() for key, rate in pairs}
+
+
+# Token-bucket rate limits, as "<count>/<second|minute|hour|day>": the default
+# per client and route, and overrides per route path and per client address.
+# RATE_LIMIT_EXEMPT lists the networks (comma-separated CIDRs) never limited;
+# only loopback by default, so deployments must name their internal callers
+# (e.g. the evaluator's pod or compose network) explicitly.
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100/minute")
+RATE_LIMIT_ROUTES = _overrides("RATE_LIMIT_ROUTES")
+RATE_LIMIT_CLIENTS = _overrides("RATE_LIMIT_CLIENTS")
+RATE_LIMIT_EXEMPT = [
+    net.strip()
+    for net in os.getenv("RATE_LIMIT_EXEMPT", "127.0.0.0/8,::1/128").split(",")
+    if net.strip()
+]
+# Admission control: concurrent requests per route (ADMISSION_ROUTE_LIMITS
+# overrides per path, e.g. "/predict=128"), requests allowed to queue behind
+# them and for how long, and the Retry-After hint sent with a shed request.
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", 64))
+ADMISSION_ROUTE_LIMITS = {
+    path: int(limit) for path, limit in _overrides("ADMISSION_ROUTE_LIMITS").items()
+}
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", 32))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", 100))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1))
+
 # Health check URLs for the auditor
 HEALTH_CHECK_URLS = {
     "proposer": "http://proposer:8000/health",
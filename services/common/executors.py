@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from services.common import config
+from services.common.solvers import warm_up_solvers
+
+logger = logging.getLogger("executors")
+
+
+class TaskExecutors:
+    """Bounded executors that keep CPU-bound work off the event loop.
+
+    Every ``(task_id, kind)`` pair gets its own executor, and so its own
+    queue, created on first use: a flood of reasoning prompts waits behind
+    its own workers and never in front of tabular predictions or ``/health``.
+    ``"solver"`` work runs in a process pool (or threads, per
+    ``SOLVER_EXECUTOR``); ``"inference"`` runs in threads, where NumPy and
+    scikit-learn release the GIL. With ``SOLVER_WARMUP`` on, every solver
+    process or thread runs :func:`warm_up_solvers` before its first task.
+    A process pool broken by a dying worker is replaced, and the call that
+    hit it retried once.
+    """
+
+    def __init__(self, solver_kind=None, solver_workers=None, inference_workers=None):
+        self.solver_kind = solver_kind or config.SOLVER_EXECUTOR
+        self.solver_workers = solver_workers or config.SOLVER_EXECUTOR_WORKERS
+        self.inference_workers = inference_workers or config.INFERENCE_EXECUTOR_WORKERS
+        self._executors = {}
+
+    def _create(self, task_id, kind):
+        name = f"{kind}-{task_id}"
+        if kind != "solver":
+            return ThreadPoolExecutor(
+                max_workers=self.inference_workers, thread_name_prefix=name
+            )
+        initializer = warm_up_solvers if config.SOLVER_WARMUP else None
+        if self.solver_kind == "process":
+            # Spawned, not forked: the service process already runs threads.
+            return ProcessPoolExecutor(
+                max_workers=self.solver_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.solver_workers,
+            thread_name_prefix=name,
+            initializer=initializer,
+        )
+
+    def get(self, task_id, kind):
+        key = (task_id, kind)
+        if key not in self._executors:
+            logger.info(f"Starting {kind} executor for task '{task_id}'")
+            self._executors[key] = self._create(task_id, kind)
+        return self._executors[key]
+
+    async def run(self, task_id, kind, fn, *args):
+        loop = asyncio.get_running_loop()
+        executor = self.get(task_id, kind)
+        try:
+            return await loop.run_in_executor(executor, partial(fn, *args))
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash) and took the pool with it;
+            # replace the pool and retry once.
+            logger.warning(f"{kind} pool for task '{task_id}' broke; restarting it")
+            if self._executors.get((task_id, kind)) is executor:
+                del self._executors[(task_id, kind)]
+                executor.shutdown(wait=False)
+            return await loop.run_in_executor(
+                self.get(task_id, kind), partial(fn, *args)
+            )
+
+    async def solve(self, task_id, fn, *args):
+        """Run solver work for ``task_id`` off the event loop."""
+        return await self.run(task_id, "solver", fn, *args)
+
+    async def infer(self, task_id, fn, *args):
+        """Run model inference for ``task_id`` off the event loop."""
+        return await self.run(task_id, "inference", fn, *args)
+
+    def shutdown(self, wait=True):
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self._executors.clear()
@@ -4,19 +4,145 @@ REQUESTS = Counter(
     "service_requests_total", "Total HTTP requests", ["service", "path", "method"]
 )
 D_VALUE = Gauge("dissonance_value", "Current computed dissonance D", ["service"])
+D_DISTRIBUTION = Histogram(
+    "dissonance_distribution",
+    "Distribution of computed dissonance D",
+    ["service"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0),
+)
+MICROBATCH_QUEUE_DEPTH = Gauge(
+    "microbatch_queue_depth",
+    "Requests waiting in a model micro-batcher",
+    ["service", "task"],
+)
+MICROBATCH_SIZE = Histogram(
+    "microbatch_size",
+    "Requests merged into one model call",
+    ["service", "task"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+MICROBATCH_WAIT = Histogram(
+    "microbatch_wait_seconds",
+    "Time a request waited in a micro-batcher before its batch ran",
+    ["service", "task"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
 REQ_LATENCY = Histogram(
     "service_request_duration_seconds", "Request latency", ["service", "path"]
 )
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the token-bucket rate limiter",
+    ["service", "path"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Requests a route is working on",
+    ["service", "path"],
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "Requests waiting for a route's admission slot",
+    ["service", "path"],
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "Requests shed with a 503 because a route was at capacity",
+    ["service", "path"],
+)
 EVALUATION_LOOP_TIMEOUTS_TOTAL = Counter(
     "evaluation_loop_timeouts_total",
     "Total timeouts in the evaluation loop",
     ["service"],
 )
+SOLVER_CACHE_EVENTS = Counter(
+    "solver_cache_events_total",
+    "Solver result cache hits, misses and evictions",
+    ["tier", "event"],
+)
+SOLVER_BUDGET_EXHAUSTED = Counter(
+    "solver_budget_exhausted_total",
+    "Solves that ran out of their time budget",
+    ["category"],
+)
+SOLVER_STAGE_SECONDS = Histogram(
+    "solver_stage_duration_seconds",
+    "Time spent in each solver stage",
+    ["category", "stage"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+SOLVER_STAGE_CANDIDATES = Counter(
+    "solver_stage_candidates_total",
+    "Candidates examined by each solver stage",
+    ["category", "stage"],
+)
+SOLVER_STAGE_HITS = Counter(
+    "solver_stage_hits_total",
+    "Solves a solver stage decided (part of) the answer for",
+    ["category", "stage"],
+)
+MODEL_CACHE_EVENTS = Counter(
+    "model_artifact_cache_events_total",
+    "Model artifact cache hits, misses, corrupt entries and evictions",
+    ["event"],
+)
 
 
 def instrument_request(service: str, path: str, method: str):
     REQUESTS.labels(service=service, path=path, method=method).inc()
 
 
+def record_rate_limited(service: str, path: str):
+    RATE_LIMIT_REJECTIONS.labels(service=service, path=path).inc()
+
+
+def set_admission_state(service: str, path: str, in_flight: int, queued: int):
+    ADMISSION_IN_FLIGHT.labels(service=service, path=path).set(in_flight)
+    ADMISSION_QUEUE_DEPTH.labels(service=service, path=path).set(queued)
+
+
+def record_admission_shed(service: str, path: str):
+    ADMISSION_SHED.labels(service=service, path=path).inc()
+
+
 def set_d_value(service: str, value: float):
     D_VALUE.labels(service=service).set(value)
+
+
+def observe_d_values(service: str, values):
+    histogram = D_DISTRIBUTION.labels(service=service)
+    for value in values:
+        histogram.observe(float(value))
+
+
+def record_solver_cache(tier: str, event: str):
+    SOLVER_CACHE_EVENTS.labels(tier=tier, event=event).inc()
+
+
+def record_model_cache(event: str):
+    MODEL_CACHE_EVENTS.labels(event=event).inc()
+
+
+def record_solver_budget_exhausted(category: str):
+    SOLVER_BUDGET_EXHAUSTED.labels(category=category).inc()
+
+
+def record_solver_stage(
+    category: str, stage: str, seconds: float, candidates: int, hit: bool
+):
+    SOLVER_STAGE_SECONDS.labels(category=category, stage=stage).observe(seconds)
+    SOLVER_STAGE_CANDIDATES.labels(category=category, stage=stage).inc(candidates)
+    if hit:
+        SOLVER_STAGE_HITS.labels(category=category, stage=stage).inc()
+
+
+def set_microbatch_queue_depth(service: str, task: str, depth: int):
+    MICROBATCH_QUEUE_DEPTH.labels(service=service, task=task).set(depth)
+
+
+def observe_microbatch(service: str, task: str, size: int, waits, depth: int):
+    MICROBATCH_SIZE.labels(service=service, task=task).observe(size)
+    wait = MICROBATCH_WAIT.labels(service=service, task=task)
+    for seconds in waits:
+        wait.observe(seconds)
+    set_microbatch_queue_depth(service, task, depth)
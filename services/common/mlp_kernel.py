@@ -0,0 +1,137 @@
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("mlp_kernel")
+
+
+def _logistic(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    np.reciprocal(x, out=x)
+
+
+def _tanh(x):
+    np.tanh(x, out=x)
+
+
+def _relu(x):
+    np.maximum(x, 0, out=x)
+
+
+def _identity(x):
+    pass
+
+
+_ACTIVATIONS = {
+    "logistic": _logistic,
+    "tanh": _tanh,
+    "relu": _relu,
+    "identity": _identity,
+}
+
+
+class MLPKernel:
+    """float32 forward pass of a fitted binary ``MLPClassifier``.
+
+    The weights are copied out once; every thread keeps its own activation
+    buffers, grown to the largest batch seen, so a prediction allocates
+    nothing but its input array. :meth:`predict_proba` returns the
+    probability of the positive class (``classes_[1]``).
+    """
+
+    def __init__(self, coefs, intercepts, activation, out_activation):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in coefs]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in intercepts]
+        self.activations = [_ACTIVATIONS[activation]] * (len(coefs) - 1) + [
+            _ACTIVATIONS[out_activation]
+        ]
+        self.n_features = self.weights[0].shape[0]
+        self._local = threading.local()
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """A kernel for ``model``, or None if it is not a binary MLP."""
+        try:
+            coefs, intercepts = model.coefs_, model.intercepts_
+            activation, out_activation = model.activation, model.out_activation_
+            n_classes = len(model.classes_)
+        except AttributeError:
+            return None
+        if n_classes != 2 or out_activation != "logistic":
+            return None
+        if activation not in _ACTIVATIONS:
+            return None
+        return cls(coefs, intercepts, activation, out_activation)
+
+    def _buffers(self, n):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None or len(buffers[0]) < n:
+            buffers = [
+                np.empty((n, w.shape[1]), dtype=np.float32) for w in self.weights
+            ]
+            self._local.buffers = buffers
+        return [buffer[:n] for buffer in buffers]
+
+    def predict_proba(self, X):
+        h = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features)
+        outs = self._buffers(len(h))
+        layers = zip(self.weights, self.biases, self.activations, outs)
+        for W, b, activate, out in layers:
+            np.dot(h, W, out=out)
+            out += b
+            activate(out)
+            h = out
+        return h[:, 0].astype(np.float64)
+
+
+class KernelModel:
+    """A loaded model served through an :class:`MLPKernel`.
+
+    Stands in for the ``mlflow.pyfunc`` model it was built from: same
+    ``metadata``, and ``predict`` returns positive-class probabilities
+    instead of labels.
+    """
+
+    def __init__(self, kernel, pyfunc_model):
+        self.kernel = kernel
+        self.metadata = pyfunc_model.metadata
+        self.pyfunc_model = pyfunc_model
+
+    def predict(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy(dtype=np.float32)
+        return self.kernel.predict_proba(X)
+
+    def predict_rows(self, rows):
+        return self.kernel.predict_proba(rows)
+
+
+def _raw_model(pyfunc_model):
+    try:
+        return pyfunc_model.get_raw_model()
+    except Exception:
+        impl = getattr(pyfunc_model, "_model_impl", None)
+        return getattr(impl, "sklearn_model", None)
+
+
+def fast_model(pyfunc_model):
+    """``pyfunc_model`` served through an :class:`MLPKernel` when possible.
+
+    Models whose flavor is not a binary sklearn MLP are returned unchanged.
+    """
+    kernel = MLPKernel.from_sklearn(_raw_model(pyfunc_model))
+    if kernel is None:
+        logger.info("Model is not a binary MLP; serving it through pyfunc.")
+        return pyfunc_model
+    return KernelModel(kernel, pyfunc_model)
+
+
+def predict_rows(model, rows, feature_names):
+    """Predictions for feature ``rows``, skipping pandas for kernel models."""
+    if isinstance(model, KernelModel):
+        return model.predict_rows(rows)
+    return model.predict(pd.DataFrame(np.array(rows), columns=feature_names))
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Dict
+
+from services.common import config
+from services.common.artifact_cache import load_model
+from services.common.mlp_kernel import fast_model, predict_rows
+
+REASONING_TASK = "nemotron_reasoning"
+
+
+def warm_up(model, task_id):
+    """Run synthetic predictions so the first real request is not cold.
+
+    A single row and a batch of ``MODEL_WARMUP_ROWS`` rows go through
+    :func:`predict_rows`, covering both the per-request and the micro-batch
+    shapes.
+    """
+    if task_id == REASONING_TASK or config.MODEL_WARMUP_ROWS <= 0:
+        return
+    feature_names = config.get_task_config(task_id)["feature_names"]
+    rng = random.Random(0)
+    for n in (1, config.MODEL_WARMUP_ROWS):
+        rows = [[rng.gauss(0.0, 1.0) for _ in feature_names] for _ in range(n)]
+        predict_rows(model, rows, feature_names)
+
+
+class ModelState:
+    """The task models a service serves, and how far each one has loaded.
+
+    ``model_key`` names the registered model in each task's config (e.g.
+    ``"proposer_model_name"``). Tasks load concurrently, each in a worker
+    thread with exponential backoff between attempts that never blocks the
+    event loop. With ``lazy`` set, nothing loads up front and a task loads
+    on its first :meth:`ensure_model`. A model is warmed up with synthetic
+    rows before it is served. ``load_states`` maps every task to
+    ``"pending"``, ``"loading"``, ``"loaded"`` or ``"failed"``, and
+    ``solver_state`` tracks the solver pool warm-up the same way.
+    """
+
+    def __init__(self, service: str, model_key: str, lazy: bool = None):
+        self.model_key = model_key
+        self.lazy = config.MODEL_LOAD_MODE == "lazy" if lazy is None else lazy
+        self.models: Dict[str, Any] = {}
+        self.model_versions: Dict[str, str] = {}
+        self.load_states: Dict[str, str] = {t: "pending" for t in config.TASKS}
+        self.solver_state = "pending"
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.logger = logging.getLogger(service)
+
+    def after_fork(self):
+        # Locks belong to the parent's event loop; a forked worker needs its own.
+        self._locks = {}
+
+    async def load_task_model(self, task_id: str) -> bool:
+        task_cfg = config.get_task_config(task_id)
+        model_name = task_cfg[self.model_key]
+        self.logger.info(
+            f"Attempting to load model for task '{task_id}': "
+            f"models:/{model_name}@production"
+        )
+        self.load_states[task_id] = "loading"
+
+        delay = config.MODEL_LOAD_BACKOFF_SECONDS
+        for attempt in range(config.MODEL_LOAD_ATTEMPTS):
+            try:
+                pyfunc_model = await asyncio.to_thread(load_model, model_name)
+                model = fast_model(pyfunc_model)
+                await asyncio.to_thread(warm_up, model, task_id)
+                self.models[task_id] = model
+                self.model_versions[task_id] = model.metadata.run_id
+                self.load_states[task_id] = "loaded"
+                self.logger.info(
+                    f"Model for task '{task_id}' loaded. "
+                    f"Version: {self.model_versions[task_id]}"
+                )
+                return True
+            except Exception as e:
+                self.logger.warning(
+                    f"Attempt {attempt + 1} failed for task '{task_id}': {e}. "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                if attempt + 1 < config.MODEL_LOAD_ATTEMPTS:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, config.MODEL_LOAD_BACKOFF_MAX_SECONDS)
+        self.load_states[task_id] = "failed"
+        return False
+
+    async def load_all(self) -> bool:
+        """Load every task's model concurrently; True if all loaded."""
+        results = await asyncio.gather(
+            *(self.ensure_loaded(task_id) for task_id in config.TASKS)
+        )
+        for task_id, ok in zip(config.TASKS, results):
+            if not ok:
+                self.logger.error(
+                    f"CRITICAL: Failed to load model for task '{task_id}'."
+                )
+        return all(results)
+
+    async def ensure_loaded(self, task_id: str) -> bool:
+        # One load per task at a time; later callers wait for it.
+        lock = self._locks.setdefault(task_id, asyncio.Lock())
+        async with lock:
+            if task_id in self.models:
+                return True
+            return await self.load_task_model(task_id)
+
+    async def ensure_model(self, task_id: str):
+        """The model for ``task_id``, loading it first in lazy mode."""
+        model = self.models.get(task_id)
+        if model is None and self.lazy and task_id in config.TASKS:
+            await self.ensure_loaded(task_id)
+            model = self.models.get(task_id)
+        return model
+
+    async def warm_up_solvers(self, executors):
+        """Start the reasoning solver pool and wait for it to take work.
+
+        Each pool process (or thread) warms itself up as it starts, before
+        its first task (see :class:`TaskExecutors`), so a task returning
+        means that worker is warm, and any worker started later is warmed
+        before it serves.
+        """
+        if not config.SOLVER_WARMUP or REASONING_TASK not in config.TASKS:
+            self.solver_state = "loaded"
+            return
+        self.solver_state = "loading"
+        try:
+            await asyncio.gather(
+                *(
+                    executors.solve(REASONING_TASK, os.getpid)
+                    for _ in range(executors.solver_workers)
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Solver warm-up failed: {e}")
+            self.solver_state = "failed"
+            return
+        self.solver_state = "loaded"
+
+    def readiness(self) -> Dict[str, Any]:
+        """Load states; ready once every model (unless lazy) and solver is warm."""
+        models_ready = self.lazy or all(
+            state == "loaded" for state in self.load_states.values()
+        )
+        return {
+            "ready": models_ready and self.solver_state == "loaded",
+            "lazy": self.lazy,
+            "tasks": dict(self.load_states),
+            "solver": self.solver_state,
+        }
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+
+import mlflow
+
+from services.common import config
+from services.common.artifact_cache import load_model
+from services.common.mlp_kernel import fast_model
+from services.common.model_state import warm_up
+
+logger = logging.getLogger("model_watcher")
+
+
+class ModelWatcher:
+    """Hot-swaps task models when their ``@production`` alias moves.
+
+    Every ``interval`` seconds the alias of each task's registered model
+    (named by ``model_key`` in the task config, e.g. ``"proposer_model_name"``)
+    is resolved; a version whose run differs from the one being served is
+    loaded and warmed next to the old model, then swapped into ``state``'s
+    ``models`` and ``model_versions`` in one assignment each. Requests that
+    already hold the old model finish on it.
+    """
+
+    def __init__(self, state, model_key, interval=None):
+        self.state = state
+        self.model_key = model_key
+        if interval is None:
+            interval = config.MODEL_RELOAD_INTERVAL_SECONDS
+        self.interval = interval
+        self._client = None
+
+    def _production_version(self, model_name):
+        if self._client is None:
+            self._client = mlflow.tracking.MlflowClient()
+        return self._client.get_model_version_by_alias(model_name, "production")
+
+    def _load(self, task_id, model_name, version):
+        model = fast_model(load_model(model_name, version))
+        warm_up(model, task_id)
+        return model
+
+    async def check(self, task_id):
+        """Swap in a new production model for ``task_id``; True if swapped."""
+        model_name = config.get_task_config(task_id)[self.model_key]
+        latest = await asyncio.to_thread(self._production_version, model_name)
+        if latest.run_id == self.state.model_versions.get(task_id):
+            return False
+
+        logger.info(
+            f"'{model_name}' production alias moved to version {latest.version}; "
+            "reloading."
+        )
+        model = await asyncio.to_thread(self._load, task_id, model_name, latest.version)
+        self.state.models[task_id] = model
+        self.state.model_versions[task_id] = model.metadata.run_id
+        logger.info(f"Task '{task_id}' now serves run {model.metadata.run_id}.")
+        return True
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # Only tasks already being served; lazy ones load on first use.
+            for task_id in list(self.state.models):
+                try:
+                    await self.check(task_id)
+                except Exception as e:
+                    logger.warning(f"Model reload check failed for '{task_id}': {e}")
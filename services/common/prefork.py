@@ -0,0 +1,90 @@
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+
+import uvicorn
+
+from services.common import config
+
+logger = logging.getLogger("prefork")
+
+
+def _listen(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn(app, state, sock):
+    pid = os.fork()
+    if pid:
+        return pid
+    # Worker: default signal handling (uvicorn installs its own), a fresh
+    # event loop, and the models inherited from the parent.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    state.after_fork()
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on"))
+    try:
+        server.run(sockets=[sock])
+    finally:
+        os._exit(0)
+
+
+def serve(app, state, host="0.0.0.0", port=8000, workers=None):
+    """Serve ``app`` from ``workers`` forked processes sharing one model set.
+
+    ``state`` is the service's :class:`ModelState`. The parent loads every
+    model once, freezes the heap so the garbage collector does not dirty
+    the shared pages, binds the listening socket and forks the workers;
+    each runs its own event loop on the inherited socket and reuses the
+    parent's models copy-on-write through ``app.state.preloaded_models``.
+    Workers that die are replaced; SIGTERM or SIGINT stops them all. With a
+    single worker this is plain ``uvicorn.run``.
+    """
+    workers = workers or config.SERVE_WORKERS
+    if workers <= 1:
+        uvicorn.run(app, host=host, port=port)
+        return
+
+    if not state.lazy and not asyncio.run(state.load_all()):
+        if not os.getenv("TEST_MODE"):
+            logger.critical("Failed to load required models. Service cannot start.")
+            sys.exit(1)
+    app.state.preloaded_models = state
+    sock = _listen(host, port)
+    gc.collect()
+    gc.freeze()
+
+    children = {_spawn(app, state, sock) for _ in range(workers)}
+    logger.info(f"Serving on {host}:{port} with {workers} workers: {children}")
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}; replacing it.")
+            children.add(_spawn(app, state, sock))
+    sock.close()
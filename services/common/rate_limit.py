@@ -0,0 +1,124 @@
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from services.common import config, metrics
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+# Probes must keep working while a client is being throttled.
+_UNLIMITED_PATHS = frozenset({"/health", "/ready"})
+
+
+def parse_rate(rate):
+    """``"100/minute"`` -> ``(100, 60)``: requests allowed per period seconds."""
+    count, _, period = rate.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if period not in _PERIODS or int(count) <= 0:
+        raise ValueError(f"Invalid rate {rate!r}")
+    return int(count), _PERIODS[period]
+
+
+class TokenBucket:
+    """``capacity`` tokens refilled continuously at ``rate`` tokens a second."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now):
+        """Take a token; return 0, or the seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+@lru_cache(maxsize=4096)
+def _is_exempt(host, networks):
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+class RateLimiter:
+    """Per-route, per-client token-bucket limits for one service.
+
+    Each (path, client) pair gets its own bucket, holding as many tokens as
+    its quota allows per period so short bursts pass. The quota is the
+    client's entry in ``clients`` if it has one, else the path's entry in
+    ``routes``, else ``default``. Clients are identified by address; those
+    inside the ``exempt`` networks (the cluster's internal traffic) are never
+    limited. Accounting is O(1) per request, and at most ``max_buckets``
+    buckets are kept, least recently used dropped first. Limits apply per
+    process. A rejected request gets a 429 with ``Retry-After`` and is counted
+    in :data:`metrics.RATE_LIMIT_REJECTIONS`.
+    """
+
+    def __init__(
+        self,
+        service,
+        default=None,
+        routes=None,
+        clients=None,
+        exempt=None,
+        max_buckets=10000,
+        clock=time.monotonic,
+    ):
+        self.service = service
+        self.default = parse_rate(default or config.RATE_LIMIT_DEFAULT)
+        routes = config.RATE_LIMIT_ROUTES if routes is None else routes
+        clients = config.RATE_LIMIT_CLIENTS if clients is None else clients
+        self.routes = {path: parse_rate(rate) for path, rate in routes.items()}
+        self.clients = {client: parse_rate(rate) for client, rate in clients.items()}
+        exempt = config.RATE_LIMIT_EXEMPT if exempt is None else exempt
+        self.exempt = tuple(ipaddress.ip_network(net, strict=False) for net in exempt)
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self._buckets = OrderedDict()
+
+    def quota(self, path, client):
+        return self.clients.get(client) or self.routes.get(path) or self.default
+
+    def check(self, path, client):
+        """Account one request; return 0 if allowed, else seconds to retry."""
+        if path in _UNLIMITED_PATHS or _is_exempt(client, self.exempt):
+            return 0.0
+        now = self.clock()
+        key = (path, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            count, period = self.quota(path, client)
+            bucket = TokenBucket(count / period, count, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(now)
+
+    async def middleware(self, request: Request, call_next):
+        path = request.url.path
+        client = request.client.host if request.client else "unknown"
+        retry_after = self.check(path, client)
+        if retry_after:
+            metrics.record_rate_limited(self.service, path)
+            count, period = self.quota(path, client)
+            return JSONResponse(
+                status_code=429,
+                content={"detail": f"Rate limit exceeded: {count} per {period}s"},
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        return await call_next(request)
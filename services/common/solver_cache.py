@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from services.common import metrics
+
+logger = logging.getLogger("solver_cache")
+
+_MISSING = object()
+
+
+def prompt_key(prompt, version):
+    """Content hash of ``prompt`` under solver ``version``."""
+    digest = hashlib.sha256(version.encode())
+    digest.update(b"\0")
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+class SolverCache:
+    """Two-tier cache of solver answers keyed by prompt hash and solver version.
+
+    A bounded in-process LRU of ``maxsize`` entries sits in front of an
+    optional SQLite store at ``path`` that survives restarts. ``None``
+    answers are cached too, so unsolvable prompts are not searched again.
+    Hits, misses and evictions are counted per tier in
+    :data:`metrics.SOLVER_CACHE_EVENTS`.
+    """
+
+    def __init__(self, version, maxsize=4096, path=None):
+        self.version = version
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _db(self):
+        # One connection per process: a forked worker must not share the
+        # parent's SQLite handle.
+        if not self.path:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS answers "
+                    "(key TEXT PRIMARY KEY, answer TEXT)"
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open solver cache {self.path}: {e}")
+                self.path = None
+                return None
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _remember(self, key, answer):
+        self._entries[key] = answer
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            metrics.record_solver_cache("memory", "eviction")
+
+    def get(self, prompt, default=None):
+        """Return the cached answer for ``prompt``, or ``default``."""
+        key = prompt_key(prompt, self.version)
+        with self._lock:
+            answer = self._entries.get(key, _MISSING)
+            if answer is not _MISSING:
+                self._entries.move_to_end(key)
+                metrics.record_solver_cache("memory", "hit")
+                return answer
+            metrics.record_solver_cache("memory", "miss")
+
+            db = self._db()
+            if db is None:
+                return default
+            try:
+                row = db.execute(
+                    "SELECT answer FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Solver cache read failed: {e}")
+                return default
+            if row is None:
+                metrics.record_solver_cache("disk", "miss")
+                return default
+            metrics.record_solver_cache("disk", "hit")
+            self._remember(key, row[0])
+            return row[0]
+
+    def put_many(self, items):
+        """Store ``(prompt, answer)`` pairs in both tiers."""
+        rows = [(prompt_key(prompt, self.version), answer) for prompt, answer in items]
+        with self._lock:
+            for key, answer in rows:
+                self._remember(key, answer)
+            db = self._db()
+            if db is None or not rows:
+                return
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO answers (key, answer) VALUES (?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Solver cache write failed: {e}")
+
+    def put(self, prompt, answer):
+        self.put_many([(prompt, answer)])
+
+    def clear(self):
+        """Drop the in-memory tier; the disk store is left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,8 +1,23 @@
+import asyncio
+import logging
+import os
 import re
-from itertools import combinations, product
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, permutations
 
 import numpy as np
 
+from services.common import config, metrics
+from services.common.solver_cache import SolverCache
+
+logger = logging.getLogger("solvers")
+
+# Part of every result cache key; bump it whenever a solver's answers change.
+SOLVER_VERSION = "11"
+
 # Expanded Wonderland dictionary for better text decoding coverage
 WONDERLAND_WORDS = [
     "above",
@@ -107,6 +122,255 @@ WONDERLAND_WORDS = [
 ]
 
 
+def word_pattern(word):
+    """Letter-repetition pattern of a word, e.g. ``"queen"`` -> ``"abccd"``."""
+    ranks = {ord(c): ord("a") + i for i, c in enumerate(dict.fromkeys(word))}
+    return word.translate(ranks)
+
+
+class WordPatternIndex:
+    """Words grouped by repetition pattern with a (position, letter) index.
+
+    A cipher word can only decode to words sharing its pattern, and letters
+    already fixed by the examples narrow that bucket to the intersection of
+    a few positional sets.
+    """
+
+    def __init__(self, words):
+        self.words = {}
+        self.positions = {}
+        for word in sorted(set(words)):
+            pattern = word_pattern(word)
+            bucket = self.words.setdefault(pattern, [])
+            slots = self.positions.setdefault(pattern, {})
+            for pos, ch in enumerate(word):
+                slots.setdefault((pos, ch), set()).add(len(bucket))
+            bucket.append(word)
+
+    def _compatible(self, cipher_word, char_map):
+        # Returns (bucket, positions in bucket) or (bucket, None) for "all".
+        pattern = word_pattern(cipher_word)
+        bucket = self.words.get(pattern)
+        if not bucket:
+            return [], set()
+        slots = self.positions[pattern]
+        candidates = None
+        for pos, c in enumerate(cipher_word):
+            mapping = char_map.get(c)
+            if mapping is None:
+                continue
+            if isinstance(mapping, set):
+                allowed = set().union(*(slots.get((pos, p), ()) for p in mapping))
+            else:
+                allowed = slots.get((pos, mapping), set())
+            candidates = allowed if candidates is None else candidates & allowed
+            if not candidates:
+                break
+        return bucket, candidates
+
+    def matches(self, cipher_word, char_map):
+        bucket, candidates = self._compatible(cipher_word, char_map)
+        if candidates is None:
+            return list(bucket)
+        return [bucket[i] for i in sorted(candidates)]
+
+
+class SolverBudgetExceeded(Exception):
+    """Raised when a solver's search runs out of time."""
+
+
+class Deadline:
+    """A cooperative time budget for one solve.
+
+    Search loops poll :meth:`expired` (or :meth:`check`, which raises
+    :class:`SolverBudgetExceeded`) and wind down once it has passed;
+    ``exhausted`` records that one of them had to. ``seconds=None`` never
+    expires.
+    """
+
+    __slots__ = ("at", "exhausted")
+
+    def __init__(self, seconds=None):
+        self.at = float("inf") if seconds is None else time.monotonic() + seconds
+        self.exhausted = False
+
+    def expired(self):
+        if not self.exhausted and time.monotonic() > self.at:
+            self.exhausted = True
+        return self.exhausted
+
+    def check(self):
+        if self.expired():
+            raise SolverBudgetExceeded()
+
+
+# Laps of the solve running on this thread, kept for _settle to record.
+_pending_laps = threading.local()
+
+
+class StageTracer:
+    """Times the consecutive stages of one solve into the stage metrics.
+
+    Each :meth:`lap` closes the stage that began at the previous lap (or at
+    construction), recording its duration, the candidates it examined and
+    whether it decided (part of) the answer. Laps taken while the service
+    solvers run are returned with the result instead and recorded by the
+    process that settles it, as pool workers' metrics are lost.
+    """
+
+    __slots__ = ("category", "last")
+
+    def __init__(self, category):
+        self.category = category
+        self.last = time.perf_counter()
+
+    def lap(self, stage, candidates=0, hit=False):
+        now = time.perf_counter()
+        lap = (self.category, stage, now - self.last, candidates, hit)
+        laps = getattr(_pending_laps, "laps", None)
+        if laps is None:
+            metrics.record_solver_stage(*lap)
+        else:
+            laps.append(lap)
+        self.last = now
+
+
+class _NullTracer:
+    __slots__ = ()
+
+    def lap(self, stage, candidates=0, hit=False):
+        pass
+
+
+_NULL_TRACER = _NullTracer()
+
+
+def stage_tracer(category):
+    """A :class:`StageTracer` when ``SOLVER_TRACING`` is on, else a no-op."""
+    return StageTracer(category) if config.SOLVER_TRACING else _NULL_TRACER
+
+
+# Upper bound on search nodes for the bijective cipher solver; past it the
+# decoder settles for a greedy left-to-right assignment.
+_CIPHER_SEARCH_NODES = 20000
+
+
+def _extend_mapping(cipher_word, plain_word, fwd, inv, options):
+    # Returns the new (cipher, plain) pairs, or None if they would break the
+    # one-to-one mapping or contradict the example-derived options.
+    added = []
+    for c, p in zip(cipher_word, plain_word):
+        known = fwd.get(c)
+        if known is not None:
+            if known != p:
+                return None
+            continue
+        if inv.get(p, c) != c or (c in options and p not in options[c]):
+            return None
+        if (c, p) not in added:
+            added.append((c, p))
+    return added
+
+
+def _assign(pairs, fwd, inv):
+    for c, p in pairs:
+        fwd[c] = p
+        inv[p] = c
+
+
+def _unassign(pairs, fwd, inv):
+    for c, p in pairs:
+        del fwd[c]
+        del inv[p]
+
+
+def _search_cipher(domains, fwd, inv, options, budget, deadline):
+    # Constraint propagation with backtracking: every step re-filters the
+    # pending words against the current mapping, fails fast on an empty
+    # domain and branches on the most constrained word.
+    if not domains:
+        return {}
+    budget[0] -= 1
+    if budget[0] < 0 or deadline.expired():
+        return None
+    filtered = {}
+    for word, candidates in domains.items():
+        alive = [
+            (cand, pairs)
+            for cand in candidates
+            if (pairs := _extend_mapping(word, cand, fwd, inv, options)) is not None
+        ]
+        if not alive:
+            return None
+        filtered[word] = alive
+    word = min(filtered, key=lambda w: len(filtered[w]))
+    rest = {w: [cand for cand, _ in filtered[w]] for w in filtered if w != word}
+    for cand, pairs in filtered[word]:
+        _assign(pairs, fwd, inv)
+        solution = _search_cipher(rest, fwd, inv, options, budget, deadline)
+        if solution is not None:
+            solution[word] = cand
+            return solution
+        _unassign(pairs, fwd, inv)
+    return None
+
+
+def decode_cipher_words(cipher_words, char_map, indexes, deadline=None):
+    """Decode cipher words jointly under a single bijective substitution.
+
+    ``char_map`` holds letters fixed by the examples (a set when examples
+    disagree) and ``indexes`` are :class:`WordPatternIndex` objects in
+    priority order. Returns the decoded words, keeping a cipher word as-is
+    when it cannot be resolved. When ``deadline`` (a :class:`Deadline`)
+    expires the joint search stops and the greedy fallback decodes instead.
+    """
+    deadline = deadline or Deadline()
+    fwd = {c: p for c, p in char_map.items() if isinstance(p, str)}
+    inv = {p: c for c, p in fwd.items()}
+    options = {c: p for c, p in char_map.items() if isinstance(p, set)}
+
+    domains = {}
+    for w in dict.fromkeys(cipher_words):
+        candidates = []
+        for index in indexes:
+            candidates.extend(
+                cand for cand in index.matches(w, char_map) if cand not in candidates
+            )
+        if candidates:
+            domains[w] = candidates
+
+    solution = _search_cipher(
+        domains, fwd, inv, options, [_CIPHER_SEARCH_NODES], deadline
+    )
+    if solution is None:
+        # No globally consistent assignment: take words left to right,
+        # keeping each choice consistent with the ones before it.
+        solution = {}
+        for w, candidates in domains.items():
+            for cand in candidates:
+                pairs = _extend_mapping(w, cand, fwd, inv, options)
+                if pairs is not None:
+                    _assign(pairs, fwd, inv)
+                    solution[w] = cand
+                    break
+    else:
+        for w, cand in solution.items():
+            _assign(_extend_mapping(w, cand, fwd, inv, options), fwd, inv)
+
+    decoded = []
+    for w in cipher_words:
+        if w in solution:
+            decoded.append(solution[w])
+        elif all(c in fwd for c in w):
+            decoded.append("".join(fwd[c] for c in w))
+        else:
+            decoded.append(w)
+    return decoded
+
+
+_WONDERLAND_INDEX = WordPatternIndex(WONDERLAND_WORDS)
+
+
 def extract_examples(prompt):
     examples = []
     lines = prompt.split("\n")
@@ -133,26 +397,167 @@ def extract_examples(prompt):
     return examples
 
 
-def solve_physics(prompt):
-    matches = re.findall(r"t = ([\d.]+)s, distance = ([\d.]+) m", prompt)
-    if not matches:
-        return None
-    gs = [(2 * float(d)) / (float(t) ** 2) for t, d in matches if float(t) > 0]
-    if not gs:
-        return None
-    g_avg = sum(gs) / len(gs)
-    target_match = re.search(r"for t = ([\d.]+)s", prompt)
-    if not target_match:
+class Puzzle:
+    """A Wonderland prompt parsed once.
+
+    ``category`` names the solver (None when the prompt is not recognised),
+    ``examples`` holds the raw ``(input, output)`` string pairs, ``target``
+    the string to solve for (None when missing) and ``arrays`` any numeric
+    views of the examples the solver works on.
+    """
+
+    __slots__ = ("prompt", "category", "examples", "target", "arrays")
+
+    def __init__(self, prompt, category, examples=(), target=None, arrays=None):
+        self.prompt = prompt
+        self.category = category
+        self.examples = examples
+        self.target = target
+        self.arrays = arrays or {}
+
+    def __repr__(self):
+        return (
+            f"Puzzle(category={self.category!r}, examples={len(self.examples)}, "
+            f"target={self.target!r})"
+        )
+
+
+# Category keywords in dispatch order: the first category whose keyword
+# appears anywhere in a prompt wins, wherever the others appear.
+_CATEGORY_KEYWORDS = (
+    ("physics", "gravitational"),
+    ("numeral", "numeral system"),
+    ("unit", "unit conversion"),
+    ("text", "encryption rules"),
+    ("equations", "applied to equations"),
+    ("bits", "bit manipulation rule"),
+)
+_CATEGORY_RES = tuple(
+    (name, re.compile(re.escape(kw), re.I)) for name, kw in _CATEGORY_KEYWORDS
+)
+
+_PHYSICS_EXAMPLE_RE = re.compile(r"t = ([\d.]+)s, distance = ([\d.]+) m")
+_PHYSICS_TARGET_RE = re.compile(r"for t = ([\d.]+)s")
+_NUMERAL_EXAMPLE_RE = re.compile(r"^(\d+) -> (\S+)$", re.M)
+_NUMERAL_TARGET_RE = re.compile(r"number (\d+)")
+_UNIT_EXAMPLE_RE = re.compile(r"([\d.]+) m becomes ([\d.]+)")
+_UNIT_TARGET_RE = re.compile(r"measurement: ([\d.]+) m")
+_TEXT_TARGET_RE = re.compile(r"text: ([a-z\s]+)$", re.I | re.M)
+_EQUATIONS_TARGET_RE = re.compile(r"for: (\S+)$", re.M)
+_BITS_EXAMPLE_RE = re.compile(r"([01]{8})\s*->\s*([01]{8})")
+_BITS_TARGET_RE = re.compile(r"for: ([01]{8})")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def classify_prompt(prompt):
+    """Return the solver category of ``prompt``, or None."""
+    for name, pattern in _CATEGORY_RES:
+        if pattern.search(prompt):
+            return name
+    return None
+
+
+def _target(pattern, prompt):
+    match = pattern.search(prompt)
+    return match.group(1) if match else None
+
+
+def _float_pairs(examples):
+    if not examples:
+        return np.zeros(0), np.zeros(0)
+    return np.array(examples, dtype=float).T
+
+
+def _parse_physics(prompt):
+    examples = _PHYSICS_EXAMPLE_RE.findall(prompt)
+    t, distance = _float_pairs(examples)
+    target = _target(_PHYSICS_TARGET_RE, prompt)
+    return examples, target, {"t": t, "distance": distance}
+
+
+def _parse_numeral(prompt):
+    return (
+        _NUMERAL_EXAMPLE_RE.findall(prompt),
+        _target(_NUMERAL_TARGET_RE, prompt),
+        None,
+    )
+
+
+def _parse_unit(prompt):
+    examples = _UNIT_EXAMPLE_RE.findall(prompt)
+    inputs, outputs = _float_pairs(examples)
+    target = _target(_UNIT_TARGET_RE, prompt)
+    return examples, target, {"inputs": inputs, "outputs": outputs}
+
+
+def _parse_text(prompt):
+    target = _target(_TEXT_TARGET_RE, prompt)
+    return extract_examples(prompt), target and target.strip().lower(), None
+
+
+def _parse_equations(prompt):
+    target = _target(_EQUATIONS_TARGET_RE, prompt)
+    return extract_examples(prompt), target and target.strip(), None
+
+
+def _parse_bits(prompt):
+    examples = _BITS_EXAMPLE_RE.findall(prompt)
+    target = _target(_BITS_TARGET_RE, prompt)
+    arrays = {
+        "inputs": _bit_matrix(inp for inp, _ in examples),
+        "outputs": _bit_matrix(outp for _, outp in examples),
+    }
+    if target is not None:
+        arrays["target"] = _bit_matrix([target])[0]
+    return examples, target, arrays
+
+
+_PARSERS = {
+    "physics": _parse_physics,
+    "numeral": _parse_numeral,
+    "unit": _parse_unit,
+    "text": _parse_text,
+    "equations": _parse_equations,
+    "bits": _parse_bits,
+}
+
+
+def parse_puzzle(prompt, category=None):
+    """Parse ``prompt`` into a :class:`Puzzle`.
+
+    The category is detected with :func:`classify_prompt` unless given.
+    """
+    if category is None:
+        category = classify_prompt(prompt)
+    if category is None:
+        return Puzzle(prompt, None)
+    examples, target, arrays = _PARSERS[category](prompt)
+    return Puzzle(prompt, category, examples, target, arrays)
+
+
+def _as_puzzle(puzzle, category):
+    # Solvers accept a parsed Puzzle or, as before, the raw prompt text.
+    if isinstance(puzzle, Puzzle):
+        return puzzle
+    return parse_puzzle(puzzle, category)
+
+
+def solve_physics(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "physics")
+    t, distance = puzzle.arrays["t"], puzzle.arrays["distance"]
+    positive = t > 0
+    if not positive.any() or puzzle.target is None:
         return None
-    t_target = float(target_match.group(1))
+    g_avg = np.mean(2 * distance[positive] / t[positive] ** 2)
+    t_target = float(puzzle.target)
     return f"{0.5 * g_avg * (t_target**2):.2f}"
 
 
-def solve_numeral(prompt):
-    match = re.search(r"number (\d+)", prompt)
-    if not match:
+def solve_numeral(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "numeral")
+    if puzzle.target is None:
         return None
-    n = int(match.group(1))
+    n = int(puzzle.target)
     val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
     syb = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
     roman = ""
@@ -163,22 +568,19 @@ def solve_numeral(prompt):
     return roman
 
 
-def solve_unit(prompt):
-    matches = re.findall(r"([\d.]+) m becomes ([\d.]+)", prompt)
-    if not matches:
-        return None
-    ratios = [float(inp) / float(outp) for inp, outp in matches if float(outp) > 0]
-    if not ratios:
-        return None
-    r_avg = sum(ratios) / len(ratios)
-    target_match = re.search(r"measurement: ([\d.]+) m", prompt)
-    if not target_match:
+def solve_unit(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "unit")
+    inputs, outputs = puzzle.arrays["inputs"], puzzle.arrays["outputs"]
+    positive = outputs > 0
+    if not positive.any() or puzzle.target is None:
         return None
-    return f"{float(target_match.group(1)) / r_avg:.2f}"
+    r_avg = np.mean(inputs[positive] / outputs[positive])
+    return f"{float(puzzle.target) / r_avg:.2f}"
 
 
-def solve_text(prompt):
-    examples = extract_examples(prompt)
+def solve_text(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "text")
+    examples = puzzle.examples
     char_map = {}
     words_from_ex = set()
     for inp, out in examples:
@@ -199,11 +601,11 @@ def solve_text(prompt):
                             else:
                                 char_map[c] = p
 
-    target_match = re.search(r"text: ([a-z\s]+)$", prompt, re.I | re.M)
-    if not target_match:
+    target_cipher = puzzle.target
+    if target_cipher is None:
         return None
-    target_cipher = target_match.group(1).strip().lower()
 
+    tracer = stage_tracer("text")
     # Constant shift heuristic
     shift_counts = {}
     for c, p in char_map.items():
@@ -213,6 +615,7 @@ def solve_text(prompt):
     if shift_counts:
         best_shift = max(shift_counts, key=shift_counts.get)
         if shift_counts[best_shift] > len(char_map) * 0.4:
+            tracer.lap("shift", len(shift_counts), hit=True)
             return "".join(
                 [
                     (
@@ -224,117 +627,511 @@ def solve_text(prompt):
                 ]
             )
 
-    all_candidates = list(set(WONDERLAND_WORDS) | words_from_ex)
-    all_candidates.sort(key=lambda x: (x not in words_from_ex, x))
-
-    words = target_cipher.split()
-    decoded_words = []
-    for w in words:
-        best_word = w
-        max_matches = -1
-        for candidate in all_candidates:
-            if len(candidate) == len(w):
-                matches = 0
-                possible = True
-                for c_char, p_char in zip(w, candidate):
-                    if c_char in char_map:
-                        mapping = char_map[c_char]
-                        if isinstance(mapping, set):
-                            if p_char not in mapping:
-                                possible = False
-                                break
-                            else:
-                                matches += 1
-                        else:
-                            if mapping != p_char:
-                                possible = False
-                                break
-                            else:
-                                matches += 1
-                if possible:
-                    if matches > max_matches:
-                        max_matches = matches
-                        best_word = candidate
-                    elif (
-                        matches == max_matches
-                        and candidate in words_from_ex
-                        and best_word not in words_from_ex
-                    ):
-                        best_word = candidate
-        decoded_words.append(best_word)
+    tracer.lap("shift", len(shift_counts))
+
+    overlay = WordPatternIndex(words_from_ex)
+    cipher_words = target_cipher.split()
+    decoded_words = decode_cipher_words(
+        cipher_words, char_map, (overlay, _WONDERLAND_INDEX), deadline
+    )
+    tracer.lap("cipher", len(cipher_words), hit=True)
     return " ".join(decoded_words)
 
 
-def solve_equations(prompt):
-    examples = extract_examples(prompt)
-    target_match = re.search(r"for: (\S+)$", prompt, re.M)
-    if not target_match:
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+# Operands below this keep every hypothesis (a*b, a.b, ...) inside int64;
+# larger ones are scored on object arrays of Python ints instead.
+_INT64_SAFE_OPERAND = 10**9
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _num_digits(x):
+    if x.dtype == object:
+        return np.vectorize(lambda v: len(str(abs(v))), otypes=[object])(x)
+    return np.maximum(np.searchsorted(_POW10, np.abs(x), side="right"), 1)
+
+
+def _digits(x):
+    # Little-endian decimal digits of |x| along a trailing axis, only as
+    # many as the largest value needs.
+    x = np.abs(x)
+    width = int(_num_digits(x.max())) if x.size else 1
+    return (x[..., None] // _POW10[:width]) % 10
+
+
+def _digit_sum(x):
+    if x.dtype == object:
+        return np.vectorize(
+            lambda v: sum(int(d) for d in str(abs(v))), otypes=[object]
+        )(x)
+    return _digits(x).sum(axis=-1)
+
+
+def _reverse_digits(x):
+    if x.dtype == object:
+        return np.vectorize(lambda v: int(str(abs(v))[::-1]), otypes=[object])(x)
+    digits = _digits(x)
+    shift = _num_digits(x)[..., None] - 1 - np.arange(digits.shape[-1])
+    return (digits * _POW10[np.maximum(shift, 0)] * (shift >= 0)).sum(axis=-1)
+
+
+class _Operands:
+    """Operand arrays with the per-operand features hypotheses share."""
+
+    __slots__ = ("a", "b", "a_len", "b_len", "a_rev", "b_rev", "a_sum", "b_sum")
+
+    def __init__(self, a, b):
+        self.a, self.b = a, b
+        self.a_len, self.b_len = _num_digits(a), _num_digits(b)
+        self.a_rev, self.b_rev = _reverse_digits(a), _reverse_digits(b)
+        self.a_sum, self.b_sum = _digit_sum(a), _digit_sum(b)
+
+
+def _safe_div(a, b, op):
+    ok = b != 0
+    return op(a, np.where(ok, b, 1)), ok
+
+
+# Hypotheses over operands -> values, or (values, valid mask). Ordered
+# simplest first; adding an operator is one entry here.
+_NUMERIC_HYPOTHESES = (
+    ("a+b", lambda o: o.a + o.b),
+    ("|a-b|", lambda o: np.abs(o.a - o.b)),
+    ("a*b", lambda o: o.a * o.b),
+    ("a//b", lambda o: _safe_div(o.a, o.b, np.floor_divide)),
+    ("a%b", lambda o: _safe_div(o.a, o.b, np.mod)),
+    ("a.b", lambda o: o.a * 10**o.b_len + o.b),
+    (
+        "first(a).first(b)",
+        lambda o: (o.a // 10 ** (o.a_len - 1)) * 10 + o.b // 10 ** (o.b_len - 1),
+    ),
+    ("last(a).last(b)", lambda o: (o.a % 10) * 10 + o.b % 10),
+    ("ds(a)+ds(b)", lambda o: o.a_sum + o.b_sum),
+    ("ds(|a-b|)", lambda o: _digit_sum(o.a - o.b)),
+    ("rev(a)+rev(b)", lambda o: o.a_rev + o.b_rev),
+    ("|rev(a)-rev(b)|", lambda o: np.abs(o.a_rev - o.b_rev)),
+    ("a-b", lambda o: o.a - o.b),
+    ("b-a", lambda o: o.b - o.a),
+    ("b.a", lambda o: o.b * 10**o.a_len + o.a),
+    ("a+b+1", lambda o: o.a + o.b + 1),
+    ("a+b-1", lambda o: o.a + o.b - 1),
+    ("a*b+1", lambda o: o.a * o.b + 1),
+    ("a*b-1", lambda o: o.a * o.b - 1),
+)
+
+
+_CANONICAL_INT = re.compile(r"-?(?:0|[1-9]\d*)")
+
+
+def _parse_int(s):
+    # Inverse of str(int): only canonical spellings decode to a value.
+    return int(s) if _CANONICAL_INT.fullmatch(s) and s != "-0" else None
+
+
+def _strip(s, prefix="", suffix=""):
+    if s.startswith(prefix) and s.endswith(suffix) and len(s) > len(prefix + suffix):
+        return s.removeprefix(prefix).removesuffix(suffix)
+    return None
+
+
+def _signed(s, op, body):
+    # Negative results written with the operator symbol in place of '-'.
+    return op + body(s[1:]) if s.startswith("-") else body(s)
+
+
+def _parse_signed(out, op, body):
+    digits = _strip(out, op) if op else None
+    if digits is not None:
+        value = _parse_int(body(digits))
+        return -value if value else None
+    return _parse_int(body(out))
+
+
+def _leading_char(values):
+    # Sign-aware first character of str(v): -1 for '-', else the digit.
+    lead = np.abs(values) // 10 ** (_num_digits(values) - 1)
+    return np.where(values < 0, -1, lead)
+
+
+def _parse_leading(out, op):
+    return -1 if out == "-" else (int(out) if len(out) == 1 and out.isdigit() else None)
+
+
+def _parse_last(out, op):
+    return int(out) if len(out) == 1 and out.isdigit() else None
+
+
+# Converters from a value to the expected output: (name, encode(str, op),
+# decode(output, op) -> key or None, key(values) or None for the value
+# itself). Decoding each expected output once turns scoring into integer
+# comparisons; encode only runs for the winning target value.
+_NUMERIC_CONVERTERS = (
+    ("str", lambda s, op: s, lambda o, op: _parse_int(o), None),
+    (
+        "str+op",
+        lambda s, op: s + op,
+        lambda o, op: _parse_int(_strip(o, suffix=op) or ""),
+        None,
+    ),
+    (
+        "op+str",
+        lambda s, op: op + s,
+        lambda o, op: _parse_int(_strip(o, prefix=op) or ""),
+        None,
+    ),
+    ("first", lambda s, op: s[0], _parse_leading, _leading_char),
+    ("last", lambda s, op: s[-1], _parse_last, lambda v: np.abs(v) % 10),
+    ("reversed", lambda s, op: s[::-1], lambda o, op: _parse_int(o[::-1]), None),
+    (
+        "op-signed",
+        lambda s, op: _signed(s, op, lambda d: d),
+        lambda o, op: _parse_signed(o, op, lambda d: d),
+        None,
+    ),
+    (
+        "op-signed reversed",
+        lambda s, op: _signed(s, op, lambda d: d[::-1]),
+        lambda o, op: _parse_signed(o, op, lambda d: d[::-1]),
+        None,
+    ),
+)
+
+
+def _solve_numeric_grid(examples, target, op):
+    """Score every operand view x hypothesis x converter in one pass.
+
+    ``examples`` are ``(a, b, output)`` triples sharing the target operator.
+    Each hypothesis is evaluated on one array holding all example operand
+    pairs plus the target, for plain and digit-reversed operands. Expected
+    outputs are decoded once per converter, so the whole grid is scored with
+    integer comparisons and only the winning target value is formatted.
+    Operands too large for exact int64 arithmetic are scored as Python ints.
+    """
+    a = [n1 for n1, _, _ in examples] + [target[0]]
+    b = [n2 for _, n2, _ in examples] + [target[1]]
+    small = max(a + b) < _INT64_SAFE_OPERAND
+    dtype = np.int64 if small else object
+    a, b = np.array(a, dtype=dtype), np.array(b, dtype=dtype)
+    # Plain and digit-reversed operands side by side, so every hypothesis
+    # is a single array expression covering both views.
+    operands = _Operands(
+        np.concatenate([a, _reverse_digits(a)]), np.concatenate([b, _reverse_digits(b)])
+    )
+
+    n = len(a)
+    values = np.empty((len(_NUMERIC_HYPOTHESES), 2 * n), dtype=dtype)
+    valid = np.ones(values.shape, dtype=bool)
+    for row, (_, hypothesis) in enumerate(_NUMERIC_HYPOTHESES):
+        out = hypothesis(operands)
+        if isinstance(out, tuple):
+            out, valid[row] = out
+        values[row] = out
+    # Rows: plain operands for every hypothesis, then reversed operands.
+    values = values.reshape(-1, 2, n).transpose(1, 0, 2).reshape(-1, n)
+    valid = valid.reshape(-1, 2, n).transpose(1, 0, 2).reshape(-1, n).all(axis=1)
+
+    scores = []
+    for _, _, decode, key in _NUMERIC_CONVERTERS:
+        expected = [decode(out, op) for _, _, out in examples]
+        # An int64 grid holds values below 1e18, so it cannot match a larger one.
+        if None in expected or (small and max(map(abs, expected)) > _INT64_MAX):
+            scores.append(np.zeros(len(values), dtype=bool))
+            continue
+        keys = values[:, :-1] if key is None else key(values[:, :-1])
+        scores.append((keys == np.array(expected, dtype=dtype)).all(axis=1))
+    hits = np.stack(scores, axis=1) & valid[:, None]
+
+    for row, col in zip(*np.nonzero(hits)):
+        res = _NUMERIC_CONVERTERS[col][1](str(values[row, -1]), op)
+        if res:
+            return res
+    return None
+
+
+def _plain_layout(out, order):
+    if out.startswith("-"):
+        return [(-1, out[1:], order)] if len(out) > 1 else []
+    return [(1, out, order)] if out else []
+
+
+def _signed_layout(out, op, order):
+    if out.startswith(op) and len(out) > len(op):
+        return [(-1, out.removeprefix(op), order), (1, out, order)]
+    return [(1, out, order)] if out else []
+
+
+# How each numeric converter spells a value with digit symbols, as
+# (sign, body, order) layouts: sign 1/-1 (or 0 for either), body the digit
+# symbols and order "msb"/"lsb" for full numbers or "first"/"last" digits.
+_SYMBOLIC_LAYOUTS = (
+    lambda o, op: _plain_layout(o, "msb"),
+    lambda o, op: _plain_layout(o.removesuffix(op), "msb") if o.endswith(op) else [],
+    lambda o, op: _plain_layout(o.removeprefix(op), "msb") if o.startswith(op) else [],
+    lambda o, op: (
+        [(-1, "", "first")] if o == "-" else [(1, o, "first")] if len(o) == 1 else []
+    ),
+    lambda o, op: [(0, o, "last")] if len(o) == 1 else [],
+    lambda o, op: (
+        [(-1, o[:-1], "lsb")] if o.endswith("-") and len(o) > 1 else [(1, o, "lsb")]
+    ),
+    lambda o, op: _signed_layout(o, op, "msb"),
+    lambda o, op: _signed_layout(o, op, "lsb"),
+)
+
+
+@lru_cache(maxsize=None)
+def _digit_permutations(k):
+    # All injective assignments of k symbols to digits, with a bitmask row.
+    if k == 0:
+        return np.zeros((1, 0), dtype=np.int64), np.zeros(1, dtype=np.int64)
+    rows = np.array(list(permutations(range(10), k)), dtype=np.int64)
+    return rows, (1 << rows).sum(axis=1)
+
+
+def _layout_digits(values, sign, body, order):
+    # Returns (ok mask, digits per body position) for every value.
+    mags = np.abs(values)
+    ok = (
+        values >= 0
+        if sign == 1
+        else values < 0 if sign == -1 else np.ones_like(mags, bool)
+    )
+    length = len(body)
+    if order == "first":
+        if not length:
+            return ok, []
+        return ok, [mags // _POW10[_num_digits(mags) - 1]]
+    if order == "last":
+        return ok, [mags % 10]
+    ok = ok & (_num_digits(mags) == length)
+    powers = range(length - 1, -1, -1) if order == "msb" else range(length)
+    return ok, [(mags // _POW10[k]) % 10 for k in powers]
+
+
+class _SymbolicEquations:
+    """Joint search for a symbol->digit map and each operator's hidden rule.
+
+    Examples are ``(a_symbols, op, b_symbols, output)``. The search walks
+    the examples most-constrained first; at every step the digits of the
+    example's unassigned operand symbols are enumerated as one array, every
+    still-possible (hypothesis, converter) pair of its operator is evaluated
+    on all of them at once, and the output symbols prune the candidates:
+    fixed symbols must match, new ones must take unused digits (all-different)
+    and full numbers must have exactly as many digits as symbols, so outputs
+    cannot start with a zero. The first complete consistent assignment wins.
+    """
+
+    def __init__(self, examples, deadline):
+        self.examples = examples
+        self.deadline = deadline
+        self.n_pairs = 2 * len(_NUMERIC_HYPOTHESES), len(_NUMERIC_CONVERTERS)
+
+    def solve(self):
+        ops = {op for _, op, _, _ in self.examples}
+        alive = {op: np.ones(self.n_pairs, dtype=bool) for op in ops}
+        return self._search(list(self.examples), {}, 0, alive)
+
+    def _search(self, pending, sigma, used, alive):
+        if not pending:
+            return sigma, alive
+        self.deadline.check()
+        # Fewest unassigned operand symbols first, then the operator with
+        # the fewest surviving rules.
+        pending = sorted(
+            pending,
+            key=lambda ex: (len(set(ex[0] + ex[2]) - sigma.keys()), alive[ex[1]].sum()),
+        )
+        example, rest = pending[0], pending[1:]
+        op = example[1]
+        for assigned, pairs in self._expand(example, sigma, used, alive[op]):
+            child = dict(sigma)
+            child.update(assigned)
+            child_used = used | sum(1 << d for d in assigned.values())
+            found = self._search(rest, child, child_used, {**alive, op: pairs})
+            if found is not None:
+                return found
         return None
-    target = target_match.group(1).strip()
 
+    def _expand(self, example, sigma, used, alive):
+        a_syms, op, b_syms, out = example
+        new = [s for s in dict.fromkeys(a_syms + b_syms) if s not in sigma]
+        perms, bits = _digit_permutations(len(new))
+        free = (bits & used) == 0
+        perms, bits = perms[free], bits[free]
+        if not len(perms):
+            return
+        columns = {s: perms[:, j] for j, s in enumerate(new)}
+
+        def digit(s):
+            return columns[s] if s in columns else np.full(len(perms), sigma[s])
+
+        a = digit(a_syms[0]) * 10 + digit(a_syms[1])
+        b = digit(b_syms[0]) * 10 + digit(b_syms[1])
+        values = _hypothesis_rows(a, b, np.flatnonzero(alive.any(axis=1)))
+
+        # Survivors as (candidate, new output symbols + digits, pair) arrays;
+        # a child of the search is one distinct (candidate, output digits).
+        n_conv = self.n_pairs[1]
+        groups = {}
+        for conv, layout in enumerate(_SYMBOLIC_LAYOUTS):
+            rows = np.flatnonzero(alive[:, conv])
+            if not len(rows):
+                continue
+            self.deadline.check()
+            for sign, body, order in layout(out, op):
+                ok, digits = _layout_digits(values[rows], sign, body, order)
+                out_new = []
+                for sym, d in zip(body, digits):
+                    if sym in sigma:
+                        ok = ok & (d == sigma[sym])
+                    elif sym in columns:
+                        ok = ok & (d == columns[sym])
+                    elif sym in out_new:
+                        ok = ok & (d == digits[body.index(sym)])
+                    else:
+                        for other in out_new:
+                            ok = ok & (d != digits[body.index(other)])
+                        ok = ok & ((used | bits) >> d & 1 == 0)
+                        out_new.append(sym)
+                r, n = np.nonzero(ok)
+                code = np.zeros(len(n), dtype=np.int64)
+                for sym in out_new:
+                    code = code * 10 + digits[body.index(sym)][r, n]
+                groups.setdefault(tuple(out_new), []).append(
+                    (n * 10 ** len(out_new) + code, rows[r] * n_conv + conv)
+                )
+
+        children = []
+        for out_new, parts in groups.items():
+            keys = np.concatenate([k for k, _ in parts])
+            if not len(keys):
+                continue
+            pairs = np.concatenate([p for _, p in parts])
+            order = np.lexsort((pairs, keys))
+            keys, pairs = keys[order], pairs[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)]
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                children.append(
+                    (int(pairs[start]), int(keys[start]), out_new, pairs[start:end])
+                )
+
+        # Candidates whose best surviving pair comes first are tried first.
+        children.sort(key=lambda child: child[:2])
+        for _, key, out_new, pair_ids in children:
+            n, code = divmod(key, 10 ** len(out_new))
+            assigned = {s: int(perms[n, j]) for j, s in enumerate(new)}
+            for sym in reversed(out_new):
+                code, assigned[sym] = divmod(code, 10)
+            mask = np.zeros(self.n_pairs[0] * n_conv, dtype=bool)
+            mask[pair_ids] = True
+            yield assigned, mask.reshape(self.n_pairs)
+
+
+def _hypothesis_rows(a, b, needed=None):
+    # Every hypothesis for plain then digit-reversed operands: (2H, len(a)).
+    # Hypotheses outside ``needed`` (row indices) are left invalid.
+    operands = _Operands(
+        np.concatenate([a, _reverse_digits(a)]), np.concatenate([b, _reverse_digits(b)])
+    )
+    n = len(a)
+    n_hyp = len(_NUMERIC_HYPOTHESES)
+    values = np.zeros((n_hyp, 2 * n), dtype=np.int64)
+    valid = np.ones(values.shape, dtype=bool)
+    hypotheses = set(range(n_hyp)) if needed is None else {r % n_hyp for r in needed}
+    for row, (_, hypothesis) in enumerate(_NUMERIC_HYPOTHESES):
+        if row not in hypotheses:
+            valid[row] = False
+            continue
+        out = hypothesis(operands)
+        if isinstance(out, tuple):
+            out, valid[row] = out
+        values[row] = out
+    values = values.reshape(-1, 2, n).transpose(1, 0, 2).reshape(-1, n)
+    valid = valid.reshape(-1, 2, n).transpose(1, 0, 2).reshape(-1, n)
+    # Invalid entries (division by zero) get a value no layout accepts.
+    return np.where(valid, values, np.iinfo(np.int64).min // 2)
+
+
+def solve_symbolic_equation(examples, target, time_budget=None, deadline=None):
+    """Solve a cryptarithm-style equation puzzle written in symbols.
+
+    ``examples`` are ``(input, output)`` pairs whose inputs, like
+    ``target``, are two 2-symbol operands around an operator symbol. Returns
+    the target output spelled in the same symbols, or None when no
+    consistent reading is found within ``time_budget`` seconds (or before
+    an earlier ``deadline``). Running out of either marks ``deadline``
+    exhausted, so the caller's result is not taken as a complete search.
+    """
+    if time_budget is None:
+        time_budget = config.CRYPTARITHM_TIME_BUDGET_SECONDS
+    parsed = [
+        (inp[:2], inp[2], inp[3:], out)
+        for inp, out in examples
+        if len(inp) == 5 and out
+    ]
+    t_a, t_op, t_b = target[:2], target[2], target[3:]
+    if not any(op == t_op for _, op, _, _ in parsed):
+        return None
+
+    own = Deadline(time_budget)
+    if deadline is not None and deadline.at < own.at:
+        own = deadline
+    search = _SymbolicEquations(parsed, own)
+    try:
+        found = search.solve()
+    except SolverBudgetExceeded:
+        logger.debug(f"Symbolic equation search exceeded {time_budget}s budget")
+        found = None
+    if own.exhausted and deadline is not None:
+        deadline.exhausted = True
+    if found is None:
+        return None
+    sigma, alive = found
+    if any(s not in sigma for s in t_a + t_b):
+        return None
+
+    a = np.array([sigma[t_a[0]] * 10 + sigma[t_a[1]]])
+    b = np.array([sigma[t_b[0]] * 10 + sigma[t_b[1]]])
+    values = _hypothesis_rows(a, b)[:, 0]
+    symbols = {d: s for s, d in sigma.items()}
+    for row, conv in zip(*np.nonzero(alive[t_op])):
+        text = _NUMERIC_CONVERTERS[conv][1](str(values[row]), t_op)
+        if all(not ch.isdigit() or int(ch) in symbols for ch in text):
+            return "".join(symbols[int(ch)] if ch.isdigit() else ch for ch in text)
+    return None
+
+
+def solve_equations(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "equations")
+    examples, target = puzzle.examples, puzzle.target
+    if target is None:
+        return None
+
+    tracer = stage_tracer("equations")
     num_ex = []
     for inp, out in examples:
-        nums = re.findall(r"\d+", inp)
+        nums = _DIGITS_RE.findall(inp)
         if len(nums) == 2:
             num_ex.append(
-                (int(nums[0]), int(nums[1]), out, re.sub(r"\d+", "", inp).strip())
+                (int(nums[0]), int(nums[1]), out, _DIGITS_RE.sub("", inp).strip())
             )
 
-    t_nums = re.findall(r"\d+", target)
+    t_nums = _DIGITS_RE.findall(target)
     if len(t_nums) == 2:
-        tn1, tn2 = int(t_nums[0]), int(t_nums[1])
-        t_op = re.sub(r"\d+", "", target).strip()
-
-        def digit_sum(n):
-            return sum(int(d) for d in str(abs(n)))
-
-        def reverse_int(n):
-            try:
-                return int(str(abs(n))[::-1])
-            except Exception:
-                return 0
-
-        hypotheses = [
-            lambda a, b: a + b,
-            lambda a, b: abs(a - b),
-            lambda a, b: a * b,
-            lambda a, b: a // b if b != 0 else None,
-            lambda a, b: a % b if b != 0 else None,
-            lambda a, b: int(str(a) + str(b)),
-            lambda a, b: int(str(a)[0] + str(b)[0]) if str(a) and str(b) else None,
-            lambda a, b: int(str(a)[-1] + str(b)[-1]) if str(a) and str(b) else None,
-            lambda a, b: digit_sum(a) + digit_sum(b),
-            lambda a, b: digit_sum(abs(a - b)),
-            lambda a, b: reverse_int(a) + reverse_int(b),
-            lambda a, b: abs(reverse_int(a) - reverse_int(b)),
-        ]
-
-        converters = [
-            lambda v, op: str(v),
-            lambda v, op: str(v) + op,
-            lambda v, op: op + str(v),
-            lambda v, op: str(v)[0] if str(v) else None,
-            lambda v, op: str(v)[-1] if str(v) else None,
-            lambda v, op: str(v)[::-1],
-        ]
+        t_op = _DIGITS_RE.sub("", target).strip()
+        matched = [(n1, n2, out) for n1, n2, out, op in num_ex if op == t_op]
+        if matched:
+            res = _solve_numeric_grid(matched, (int(t_nums[0]), int(t_nums[1])), t_op)
+            tracer.lap("numeric_grid", len(matched), hit=bool(res))
+            if res:
+                return res
 
-        for h in hypotheses:
-            for conv in converters:
-                consistent = True
-                found_any = False
-                for n1, n2, out, op in num_ex:
-                    if op == t_op:
-                        found_any = True
-                        val = h(n1, n2)
-                        if val is None or conv(val, op) != out:
-                            consistent = False
-                            break
-                if consistent and found_any:
-                    val = h(tn1, tn2)
-                    if val is not None:
-                        res = conv(val, t_op)
-                        if res:
-                            return res
+    if len(target) == 5 and not t_nums:
+        res = solve_symbolic_equation(examples, target, deadline=deadline)
+        tracer.lap("symbolic", len(examples), hit=bool(res))
+        if res:
+            return res
 
     # Symbolic / Pattern substitution
     sorted_ex = sorted(examples, key=lambda x: len(x[0]), reverse=True)
@@ -348,6 +1145,7 @@ def solve_equations(prompt):
                 break
         if not changed:
             break
+    tracer.lap("substitution", len(sorted_ex), hit=res != target)
 
     if res == target:
         # Fallback to token/character mapping
@@ -361,145 +1159,488 @@ def solve_equations(prompt):
                         char_map[c] = o
         char_map = {k: v for k, v in char_map.items() if v is not None}
         res = "".join([char_map.get(c, c) for c in target])
+        tracer.lap("char_map", len(char_map), hit=True)
 
     return res
 
 
-def solve_bits(prompt):
-    examples = re.findall(r"([01]{8})\s*->\s*([01]{8})", prompt)
-    target_match = re.search(r"for: ([01]{8})", prompt)
-    if not target_match:
+# Precomputed search spaces for the bit solver. Every candidate is evaluated
+# for all 8 output columns at once, in the same priority order as the
+# original one-column-at-a-time search.
+_BIT_POSITIONS = np.arange(8)
+_ROLL_INDICES = np.array(
+    [
+        (_BIT_POSITIONS - direction * rot) % 8
+        for rot in range(8)
+        for direction in (1, -1)
+    ]
+)
+_XOR_MASKS = ((np.arange(256)[:, None] >> _BIT_POSITIONS) & 1).astype(np.uint8)
+_BIT_TRIPLETS = np.array(list(combinations(range(8), 3)))
+_BIT_PAIRS = np.array(list(combinations(range(8), 2)))
+
+
+def _byte_primitives():
+    x = np.arange(256, dtype=np.uint16)
+    prims = [("x", x)]
+    for k in range(1, 8):
+        prims.append((f"rotl{k}(x)", ((x << k) | (x >> (8 - k))) & 0xFF))
+        prims.append((f"shl{k}(x)", (x << k) & 0xFF))
+        prims.append((f"shr{k}(x)", x >> k))
+    names = [name for name, _ in prims]
+    return names, np.array([values for _, values in prims], dtype=np.uint8)
+
+
+def build_byte_programs():
+    """Enumerate composed whole-byte programs as 256-entry lookup tables.
+
+    Programs are generated simplest first (unary, binary, then majority,
+    choice and two-operator ternary forms) and de-duplicated by truth table,
+    keeping the first, simplest name for every distinct function.
+    """
+    prim_names, prims = _byte_primitives()
+    ops = (("^", np.bitwise_xor), ("&", np.bitwise_and), ("|", np.bitwise_or))
+    names, blocks = [], []
+
+    def add(templates, operands, table):
+        names.extend(templates.format(*args) for args in operands)
+        blocks.append(table)
+
+    singles = [(a,) for a in prim_names]
+    add("{0}", singles, prims)
+    add("~{0}", singles, ~prims)
+
+    i, j = np.array(list(combinations(range(len(prims)), 2))).T
+    A, B = prims[i], prims[j]
+    pairs = [(prim_names[a], prim_names[b]) for a, b in zip(i, j)]
+    for sym, op in ops:
+        add(f"{{0}} {sym} {{1}}", pairs, op(A, B))
+        add(f"~({{0}} {sym} {{1}})", pairs, ~op(A, B))
+        if sym != "^":
+            add(f"{{0}} {sym} ~{{1}}", pairs, op(A, ~B))
+            add(f"~{{0}} {sym} {{1}}", pairs, op(~A, B))
+
+    i, j, k = np.array(list(combinations(range(len(prims)), 3))).T
+    A, B, C = prims[i], prims[j], prims[k]
+    triples = [
+        (prim_names[a], prim_names[b], prim_names[c]) for a, b, c in zip(i, j, k)
+    ]
+    add("maj({0}, {1}, {2})", triples, (A & B) | (A & C) | (B & C))
+    add("ch({0}, {1}, {2})", triples, (A & B) | (~A & C))
+    add("ch({1}, {0}, {2})", triples, (B & A) | (~B & C))
+    add("ch({2}, {0}, {1})", triples, (C & A) | (~C & B))
+    for sym1, op1 in ops:
+        for sym2, op2 in ops:
+            add(f"({{0}} {sym1} {{1}}) {sym2} {{2}}", triples, op2(op1(A, B), C))
+            add(f"({{0}} {sym1} {{2}}) {sym2} {{1}}", triples, op2(op1(A, C), B))
+            add(f"({{1}} {sym1} {{2}}) {sym2} {{0}}", triples, op2(op1(B, C), A))
+
+    table = np.concatenate(blocks)
+    # Rows compared as opaque 256-byte records keep the de-duplication cheap.
+    rows = np.ascontiguousarray(table).view(np.dtype((np.void, 256))).ravel()
+    _, first = np.unique(rows, return_index=True)
+    first.sort()
+    return [names[i] for i in first], table[first]
+
+
+@lru_cache(maxsize=None)
+def get_byte_programs():
+    """Return ``(names, table)`` with ``table`` a ``(P, 256)`` uint8 matrix.
+
+    Built once per process, or loaded from ``BYTE_PROGRAMS_CACHE_PATH`` when
+    that file exists (and written there after a fresh build). A cached file
+    is only used if it was written for this ``SOLVER_VERSION`` and holds one
+    name per program; any other file is rebuilt and overwritten.
+    """
+    path = config.BYTE_PROGRAMS_CACHE_PATH
+    if path and os.path.exists(path):
+        try:
+            with np.load(path) as cached:
+                version = str(cached["version"]) if "version" in cached else None
+                names, table = cached["names"].tolist(), cached["table"]
+            if version == SOLVER_VERSION and len(names) == len(table):
+                return names, table
+            logger.info(f"Byte program cache {path} is stale; rebuilding it.")
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Could not load byte program cache {path}: {e}")
+
+    names, table = build_byte_programs()
+    if path:
+        try:
+            with open(path, "wb") as f:
+                np.savez(f, version=SOLVER_VERSION, names=np.array(names), table=table)
+        except OSError as e:
+            logger.warning(f"Could not write byte program cache {path}: {e}")
+    return names, table
+
+
+def _match_byte_programs(inputs, outputs):
+    # table[:, inputs] == outputs, checked on the first example for every
+    # program and on the remaining examples only for the survivors.
+    _, table = get_byte_programs()
+    if not len(inputs):
         return None
-    target = target_match.group(1)
+    candidates = np.flatnonzero(table[:, inputs[0]] == outputs[0])
+    if len(inputs) > 1 and len(candidates):
+        rest = (table[candidates][:, inputs[1:]] == outputs[1:]).all(axis=1)
+        candidates = candidates[rest]
+    return int(candidates[0]) if len(candidates) else None
 
-    X = np.array([[int(b) for b in inp] for inp, outp in examples])
-    Y = np.array([[int(b) for b in outp] for inp, outp in examples])
-    target_vec = np.array([int(b) for b in target])
 
-    # Global transformations (Rotations/Inversions)
-    for rot in range(8):
-        for direction in [1, -1]:
+def _bit_matrix(bit_strings):
+    raw = np.frombuffer("".join(bit_strings).encode("ascii"), dtype=np.uint8)
+    return (raw - ord("0")).reshape(-1, 8)
 
-            def rot_func(vec, n):
-                return np.roll(vec, direction * n)
 
-            if all(np.array_equal(rot_func(X[k], rot), Y[k]) for k in range(len(X))):
-                return "".join(map(str, rot_func(target_vec, rot)))
-            if all(
-                np.array_equal(1 - rot_func(X[k], rot), Y[k]) for k in range(len(X))
-            ):
-                return "".join(map(str, 1 - rot_func(target_vec, rot)))
-
-    res_vec = []
-    for j in range(8):
-        y_col = Y[:, j]
-        found = False
-
-        # 1. Linear (XOR) search - all 256 subsets
-        for i in range(256):
-            subset = np.array([(i >> k) & 1 for k in range(8)])
-            for b_const in [0, 1]:
-                if np.array_equal((X @ subset + b_const) % 2, y_col):
-                    res_vec.append(int((target_vec @ subset + b_const) % 2))
-                    found = True
-                    break
-            if found:
-                break
-        if found:
-            continue
+def _match_rotations(X, Y, target_vec):
+    # Rotations/inversions of the whole byte, ordered (rotation, direction,
+    # plain before inverted).
+    rolled = X[:, _ROLL_INDICES]
+    plain = (rolled == Y[:, None, :]).all(axis=(0, 2))
+    inverted = (rolled != Y[:, None, :]).all(axis=(0, 2))
+    hits = np.stack([plain, inverted], axis=1).ravel()
+    if not hits.any():
+        return None
+    first = int(hits.argmax())
+    out = target_vec[_ROLL_INDICES[first // 2]]
+    return 1 - out if first % 2 else out
 
-        # 2. 3-bit logic function search
-        # Try triplets and find if any boolean function of them matches
-        for i1, i2, i3 in combinations(range(8), 3):
-            obs = {}
-            consistent = True
-            for k in range(len(X)):
-                key = (X[k, i1], X[k, i2], X[k, i3])
-                if key in obs and obs[key] != y_col[k]:
-                    consistent = False
-                    break
-                obs[key] = y_col[k]
-            if consistent:
-                t_key = (target_vec[i1], target_vec[i2], target_vec[i3])
-                if t_key in obs:
-                    res_vec.append(obs[t_key])
-                    found = True
-                    break
-                elif len(obs) >= 4:
-                    # Logic patterns (Majority, Choice, etc.)
-                    for bits in product([0, 1], repeat=8):
-                        f = {
-                            k_in: bits[idx]
-                            for idx, k_in in enumerate(product([0, 1], repeat=3))
-                        }
-                        if all(f[k] == v for k, v in obs.items()):
-                            res_vec.append(f[t_key])
-                            found = True
-                            break
-                if found:
-                    break
-        if found:
-            continue
 
-        # 3. 2-bit logic fallback
-        for i1, i2 in combinations(range(8), 2):
-            obs = {}
-            consistent = True
-            for k in range(len(X)):
-                key = (X[k, i1], X[k, i2])
-                if key in obs and obs[key] != y_col[k]:
-                    consistent = False
-                    break
-                obs[key] = y_col[k]
-            if consistent:
-                t_key = (target_vec[i1], target_vec[i2])
-                if t_key in obs:
-                    res_vec.append(obs[t_key])
-                    found = True
-                    break
-                elif len(obs) >= 2:
-                    for bits in product([0, 1], repeat=4):
-                        f = {
-                            k_in: bits[idx]
-                            for idx, k_in in enumerate(product([0, 1], repeat=2))
-                        }
-                        if all(f[k] == v for k, v in obs.items()):
-                            res_vec.append(f[t_key])
-                            found = True
-                            break
-                if found:
-                    break
+def _match_xor(X, Y, target_vec):
+    # Affine GF(2) functions: parity of a column subset, optionally inverted.
+    # Example columns are packed into bitsets so each (mask, column) pair is
+    # compared with a single byte-wise equality.
+    parity = (X @ _XOR_MASKS.T) & 1
+    packed = np.packbits(parity, axis=0)[:, :, None]
+    plain = (packed == np.packbits(Y, axis=0)[:, None, :]).all(axis=0)
+    inverted = (packed == np.packbits(1 - Y, axis=0)[:, None, :]).all(axis=0)
+    hits = np.stack([plain, inverted], axis=1).reshape(-1, 8)
+    found = hits.any(axis=0)
+    first = hits.argmax(axis=0)
+    values = ((_XOR_MASKS[first // 2] @ target_vec) + first % 2) & 1
+    return found, values
 
-        if not found:
-            # Absolute fallback to identity column or original bit
-            for i in range(8):
-                if np.array_equal(y_col, X[:, i]):
-                    res_vec.append(target_vec[i])
-                    found = True
-                    break
-            if not found:
-                res_vec.append(target_vec[j])
+
+def _match_truth_tables(X, Y, target_vec, subsets, min_obs):
+    # A boolean function of the columns in a subset exists iff every observed
+    # input pattern maps to a single output. When the target pattern has not
+    # been observed, the first consistent truth table in lexicographic order
+    # sets it to 0.
+    arity = subsets.shape[1]
+    weights = 1 << np.arange(arity)[::-1]
+    codes = X[:, subsets] @ weights
+    target_codes = target_vec[subsets] @ weights
+    onehot = codes[:, :, None] == np.arange(1 << arity)
+    totals = onehot.sum(axis=0)
+    ones = np.einsum("nsc,nj->scj", onehot, Y)
+    consistent = ((ones == 0) | (ones == totals[:, :, None])).all(axis=1)
+    rows = np.arange(len(subsets))
+    seen = totals[rows, target_codes] > 0
+    enough = (totals > 0).sum(axis=1) >= min_obs
+    hits = consistent & (seen | enough)[:, None]
+    found = hits.any(axis=0)
+    first = hits.argmax(axis=0)
+    values = (ones[first, target_codes[first], np.arange(8)] > 0).astype(np.uint8)
+    return found, values
+
+
+def solve_bits(puzzle, deadline=None):
+    puzzle = _as_puzzle(puzzle, "bits")
+    if puzzle.target is None:
+        return None
+
+    X, Y = puzzle.arrays["inputs"], puzzle.arrays["outputs"]
+    target_vec = puzzle.arrays["target"]
+    tracer = stage_tracer("bits")
+
+    # Global transformations (Rotations/Inversions)
+    rotated = _match_rotations(X, Y, target_vec)
+    tracer.lap("rotation", 2 * len(_ROLL_INDICES), hit=rotated is not None)
+    if rotated is not None:
+        return "".join(map(str, rotated))
+
+    # Whole-byte programs (shifts, rotations, logic, majority/choice)
+    _, table = get_byte_programs()
+    program = _match_byte_programs(
+        np.packbits(X, axis=1).ravel(), np.packbits(Y, axis=1).ravel()
+    )
+    tracer.lap("byte_program", len(table), hit=program is not None)
+    if program is not None:
+        return f"{table[program, np.packbits(target_vec)[0]]:08b}"
+
+    # Per-column search: 1. XOR subsets, 2. 3-bit logic, 3. 2-bit logic.
+    # Later stages only decide the columns earlier ones left open; once the
+    # deadline passes the open columns go to the fallback below.
+    deadline = deadline or Deadline()
+    found, res_vec = _match_xor(X, Y, target_vec)
+    tracer.lap("xor", 2 * len(_XOR_MASKS), hit=found.any())
+    for stage, subsets, min_obs in (
+        ("truth3", _BIT_TRIPLETS, 4),
+        ("truth2", _BIT_PAIRS, 2),
+    ):
+        if found.all() or deadline.expired():
+            break
+        stage_found, stage_values = _match_truth_tables(
+            X, Y, target_vec, subsets, min_obs
+        )
+        tracer.lap(stage, len(subsets), hit=(stage_found & ~found).any())
+        res_vec = np.where(found, res_vec, stage_values)
+        found |= stage_found
+
+    if not found.all():
+        # Absolute fallback to identity column or original bit
+        same = (X[:, :, None] == Y[:, None, :]).all(axis=0)
+        fallback = np.where(
+            same.any(axis=0), target_vec[same.argmax(axis=0)], target_vec
+        )
+        res_vec = np.where(found, res_vec, fallback)
+        tracer.lap("identity", 8, hit=True)
 
     return "".join(map(str, res_vec))
 
 
+_UNSOLVED = object()
+
+_SOLVERS = {
+    "physics": solve_physics,
+    "numeral": solve_numeral,
+    "unit": solve_unit,
+    "text": solve_text,
+    "equations": solve_equations,
+    "bits": solve_bits,
+}
+
+
+@lru_cache(maxsize=None)
+def get_solver_cache():
+    """Return this process's :class:`SolverCache` for ``SOLVER_VERSION``."""
+    return SolverCache(
+        SOLVER_VERSION,
+        maxsize=config.SOLVER_CACHE_SIZE,
+        path=config.SOLVER_CACHE_PATH,
+    )
+
+
+# Statuses whose answers are worth caching.
+_CACHEABLE = frozenset({"solved", "unsolved"})
+
+
+def _solve(prompt, time_budget=None):
+    # (category, answer, budget exhausted, error, stage laps) for one
+    # uncached solve. Nothing is recorded here, so it can run in a pool.
+    puzzle = _as_puzzle(prompt, None)
+    solver = _SOLVERS.get(puzzle.category)
+    if solver is None:
+        return puzzle.category, None, False, None, ()
+    if time_budget is None:
+        time_budget = config.SOLVER_TIME_BUDGETS.get(puzzle.category)
+    deadline = Deadline(time_budget)
+    laps = _pending_laps.laps = []
+    try:
+        answer = solver(puzzle, deadline=deadline)
+    finally:
+        _pending_laps.laps = None
+    return puzzle.category, answer, deadline.exhausted, None, laps
+
+
+def _settle(result):
+    # (answer, status) for a _solve result; its metrics are recorded here,
+    # in the calling process, since pool workers' metrics are lost.
+    category, answer, exhausted, error, laps = result
+    for lap in laps:
+        metrics.record_solver_stage(*lap)
+    if error is not None:
+        logger.warning(f"{category} solver failed: {error}")
+        return None, "error"
+    if exhausted:
+        metrics.record_solver_budget_exhausted(category)
+        logger.debug(f"{category} solver ran out of its time budget")
+        return answer, "budget_exhausted"
+    return answer, "unsolved" if answer is None else "solved"
+
+
+def solve_with_status(prompt, time_budget=None):
+    """Solve ``prompt`` within its category's time budget.
+
+    Returns ``(answer, status)`` with status ``"solved"``, ``"unsolved"`` or
+    ``"budget_exhausted"``; in the last case ``answer`` is the solver's best
+    partial guess (or None) and is not cached. ``time_budget`` overrides
+    ``config.SOLVER_TIME_BUDGETS`` in seconds.
+    """
+    text = prompt.prompt if isinstance(prompt, Puzzle) else prompt
+    cache = get_solver_cache()
+    answer = cache.get(text, _UNSOLVED)
+    if answer is not _UNSOLVED:
+        return answer, "unsolved" if answer is None else "solved"
+    answer, status = _settle(_solve(prompt, time_budget))
+    if status in _CACHEABLE:
+        cache.put(text, answer)
+    return answer, status
+
+
+def solve_uncached(prompt, time_budget=None):
+    """:func:`solve_with_status` that always runs the solver.
+
+    The result cache is neither read nor written, so accuracy sweeps and
+    timings reflect the current solver code.
+    """
+    return _settle(_solve(prompt, time_budget))
+
+
+# One synthetic prompt per category for :func:`warm_up_solvers`.
+WARMUP_PROMPTS = (
+    "In Alice's Wonderland, the gravitational constant has been secretly "
+    "changed. Here are some example observations:\n"
+    "For t = 1.0s, distance = 4.9 m\nFor t = 2.0s, distance = 19.6 m\n"
+    "Now, determine the falling distance for t = 3.0s given d = 0.5*g*t^2.",
+    "In Alice's Wonderland, numbers are secretly converted into a different "
+    "numeral system. Some examples are given below:\n"
+    "11 -> XI\n15 -> XV\n94 -> XCIV\n"
+    "Now, write the number 38 in the Wonderland numeral system.",
+    "In Alice's Wonderland, a secret unit conversion is applied to "
+    "measurements. For example:\n10.00 m becomes 5.00\n4.00 m becomes 2.00\n"
+    "Now, convert the following measurement: 7.00 m",
+    "In Alice's Wonderland, secret encryption rules are used on text. "
+    "Here are some examples:\n"
+    "ucoov pwgtfyoqg vorq yrjjoe -> queen discovers near valley\n"
+    "pqrsfv pqorzg wvgwpo trgbjo -> dragon dreams inside castle\n"
+    "Now, decrypt the following text: pqrsfv pwgtfyoqg trgbjo",
+    "In Alice's Wonderland, a secret set of transformation rules is applied "
+    "to equations. Below are a few examples:\n"
+    "12+30 = 42\n51+7 = 58\nNow, determine the result for: 20+22",
+    "In Alice's Wonderland, a secret bit manipulation rule transforms 8-bit "
+    "binary numbers.\n\nHere are some examples of input -> output:\n"
+    "00000001 -> 11111110\n00000110 -> 11111001\n01001101 -> 10110010\n\n"
+    "Now, determine the output for: 00001111",
+)
+
+
+def warm_up_solvers():
+    """Solve :data:`WARMUP_PROMPTS` uncached; return how many were solved.
+
+    Run in a fresh solver process so indexes, tables and imports are in
+    place before the first real prompt arrives.
+    """
+    return sum(solve_uncached(prompt)[0] is not None for prompt in WARMUP_PROMPTS)
+
+
 def wonderland_solver(prompt):
-    p_lower = prompt.lower()
-    if "gravitational" in p_lower:
-        return solve_physics(prompt)
-    elif "numeral system" in p_lower:
-        return solve_numeral(prompt)
-    elif "unit conversion" in p_lower:
-        return solve_unit(prompt)
-    elif "encryption rules" in p_lower:
-        return solve_text(prompt)
-    elif "applied to equations" in p_lower:
-        return solve_equations(prompt)
-    elif "bit manipulation rule" in p_lower:
-        return solve_bits(prompt)
-    return None
+    return solve_with_status(prompt)[0]
 
 
-def get_boxed_answer(prompt):
-    ans = wonderland_solver(prompt)
+def box_answer(ans):
     return f"\\boxed{{{ans}}}" if ans else None
+
+
+def get_boxed_answer(prompt):
+    return box_answer(wonderland_solver(prompt))
+
+
+def _solve_chunk(prompts):
+    results = []
+    for prompt in prompts:
+        try:
+            results.append(_solve(prompt))
+        except Exception as e:
+            # One failing prompt must not sink the rest of its batch.
+            error = f"{type(e).__name__}: {e}"
+            results.append((classify_prompt(prompt), None, False, error, ()))
+    return results
+
+
+def _batch_chunks(prompts, indices, chunksize):
+    # Prompt indices grouped by category, so a worker's chunk mostly hits
+    # one solver and its warm caches; input order is kept within a category.
+    order = sorted(indices, key=lambda i: classify_prompt(prompts[i]) or "")
+    for start in range(0, len(order), chunksize):
+        stop = start + chunksize
+        yield order[start:stop]
+
+
+def _lookup(prompts, cache):
+    # Cached answers by index, and the indices still to solve.
+    known, misses = {}, []
+    for i, prompt in enumerate(prompts):
+        answer = cache.get(prompt, _UNSOLVED)
+        if answer is _UNSOLVED:
+            misses.append(i)
+        else:
+            known[i] = answer
+    return known, misses
+
+
+def _iter_solve_batch(prompts, workers, chunksize):
+    # Cached answers are known up front; only the misses reach the workers.
+    cache = get_solver_cache()
+    known, misses = _lookup(prompts, cache)
+    chunks = list(_batch_chunks(prompts, misses, chunksize))
+    payloads = [[prompts[i] for i in chunk] for chunk in chunks]
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(_solve_chunk, payloads)
+        yield from _reorder(known, chunks, payloads, results, cache)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        results = pool.map(_solve_chunk, payloads)
+        yield from _reorder(known, chunks, payloads, results, cache)
+
+
+def _reorder(known, chunks, payloads, results, cache):
+    # Yield answers in input order as soon as every earlier one is known,
+    # caching each chunk's fresh answers as it arrives.
+    pending = dict(known)
+    next_index = 0
+    for chunk, payload, chunk_results in zip(chunks, payloads, results):
+        settled = [_settle(result) for result in chunk_results]
+        cache.put_many(
+            (prompt, answer)
+            for prompt, (answer, status) in zip(payload, settled)
+            if status in _CACHEABLE
+        )
+        pending.update(zip(chunk, (answer for answer, _ in settled)))
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+    while next_index in pending:
+        yield pending.pop(next_index)
+        next_index += 1
+
+
+async def solve_in_executor(run, prompts, workers=1):
+    """Answers to ``prompts``, in input order, searching via ``run``.
+
+    ``run(fn, *args)`` awaits ``fn(*args)`` elsewhere, typically a task's
+    solver pool (see :meth:`TaskExecutors.solve`). Only the uncached prompts
+    are sent there, grouped by category into at most ``workers`` chunks
+    solved concurrently; the result cache is read and written, and every
+    solver metric recorded, in this process.
+    """
+    prompts = list(prompts)
+    cache = get_solver_cache()
+    known, misses = _lookup(prompts, cache)
+    chunksize = max(1, -(-len(misses) // workers))
+    chunks = list(_batch_chunks(prompts, misses, chunksize))
+    payloads = [[prompts[i] for i in chunk] for chunk in chunks]
+    results = await asyncio.gather(*(run(_solve_chunk, p) for p in payloads))
+    return list(_reorder(known, chunks, payloads, results, cache))
+
+
+def warm_solver_cache(prompts, workers=None, chunksize=None):
+    """Solve ``prompts`` into the result cache; return how many were solved."""
+    answers = solve_batch(prompts, workers=workers, chunksize=chunksize, lazy=True)
+    return sum(answer is not None for answer in answers)
+
+
+def solve_batch(prompts, workers=None, chunksize=None, lazy=False):
+    """Solve many prompts across a process pool.
+
+    Prompts are grouped by category into chunks of ``chunksize`` and spread
+    over ``workers`` processes (``config.SOLVER_WORKERS`` by default; 1
+    solves in-process). Prompts already in the result cache are not solved
+    again. Answers come back in input order, as a list, or as an iterator
+    when ``lazy`` is set.
+    """
+    prompts = list(prompts)
+    workers = config.SOLVER_WORKERS if workers is None else workers
+    chunksize = chunksize or config.SOLVER_BATCH_CHUNKSIZE
+    answers = _iter_solve_batch(prompts, workers, chunksize)
+    return answers if lazy else list(answers)
@@ -1,86 +1,80 @@
+import asyncio
 import logging
 import math
 import os
 import sys
-import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Dict, List, Optional
 
 import mlflow
 import numpy as np
-import pandas as pd
-import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from services.common import config
+from services.common.admission import AdmissionController
+from services.common.batching import ModelBatchers
+from services.common.executors import TaskExecutors
 from services.common.logging_config import configure_logging
-from services.common.metrics import instrument_request, set_d_value
-from services.common.solvers import wonderland_solver
+from services.common.metrics import instrument_request, observe_d_values, set_d_value
+from services.common.mlp_kernel import predict_rows
+from services.common.model_state import ModelState
+from services.common.model_watcher import ModelWatcher
+from services.common.prefork import serve
+from services.common.rate_limit import RateLimiter
+from services.common.solvers import solve_in_executor
 
 # Configure logging
 configure_logging()
 logger = logging.getLogger("critic")
 SERVICE_NAME = "critic"
 
-limiter = Limiter(key_func=get_remote_address)
 
-
-class CriticState:
+class CriticState(ModelState):
     def __init__(self):
-        self.models: Dict[str, Any] = {}
-        self.model_versions: Dict[str, str] = {}
-
-    def load_task_model(self, task_id: str):
-        task_cfg = config.get_task_config(task_id)
-        model_name = task_cfg["critic_model_name"]
-        model_uri = f"models:/{model_name}@production"
-
-        logger.info(f"Attempting to load model for task '{task_id}': {model_uri}")
-
-        for attempt in range(5):
-            try:
-                model = mlflow.pyfunc.load_model(model_uri)
-                self.models[task_id] = model
-                self.model_versions[task_id] = model.metadata.run_id
-                logger.info(
-                    f"Model for task '{task_id}' loaded. Version: {self.model_versions[task_id]}"
-                )
-                return True
-            except Exception as e:
-                logger.warning(
-                    f"Attempt {attempt + 1} failed for task '{task_id}': {e}. Retrying..."
-                )
-                time.sleep(5)
-        return False
+        super().__init__(SERVICE_NAME, "critic_model_name")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Loads all models from the TASKS config on startup."""
+    """Loads all models from the TASKS config on startup (unless lazy)."""
     mlflow.set_tracking_uri(config.MLFLOW_TRACKING_URI)
-    app.state.critic = CriticState()
-
-    success = True
-    for task_id in config.TASKS.keys():
-        if not app.state.critic.load_task_model(task_id):
-            logger.error(f"CRITICAL: Failed to load model for task '{task_id}'.")
-            success = False
+    # Forked workers reuse the models their parent already loaded.
+    app.state.critic = getattr(app.state, "preloaded_models", None) or CriticState()
+    app.state.executors = TaskExecutors()
+    app.state.batchers = ModelBatchers(
+        SERVICE_NAME, app.state.critic.models, app.state.executors
+    )
+
+    if app.state.critic.lazy:
+        logger.info("Lazy model loading: tasks load on first use.")
+        success = True
+    else:
+        success = await app.state.critic.load_all()
 
     if not success and not os.getenv("TEST_MODE"):
         logger.critical("Failed to load required models. Service cannot start.")
         sys.exit(1)
 
+    # Not ready (see /ready) until the solver pool has started, warmed up.
+    warmup = asyncio.create_task(app.state.critic.warm_up_solvers(app.state.executors))
+    watcher = None
+    if config.MODEL_RELOAD_INTERVAL_SECONDS > 0:
+        watcher = asyncio.create_task(
+            ModelWatcher(app.state.critic, "critic_model_name").run()
+        )
+
     yield
+    warmup.cancel()
+    if watcher is not None:
+        watcher.cancel()
+    await app.state.batchers.close()
+    app.state.executors.shutdown(wait=False)
     app.state.critic = None
 
 
 app = FastAPI(lifespan=lifespan)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 class ContradictPayload(BaseModel):
@@ -91,8 +85,15 @@ class ContradictPayload(BaseModel):
     features: dict
 
 
+class ContradictBatch(BaseModel):
+    items: List[ContradictPayload]
+
+
+app.middleware("http")(AdmissionController(SERVICE_NAME).middleware)
+app.middleware("http")(RateLimiter(SERVICE_NAME).middleware)
+
+
 @app.middleware("http")
-@limiter.limit("100/minute")
 async def add_metrics(request: Request, call_next):
     instrument_request(SERVICE_NAME, request.url.path, request.method)
     return await call_next(request)
@@ -103,11 +104,75 @@ def health(request: Request):
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(request: Request, response: Response):
+    readiness = request.app.state.critic.readiness()
+    if not readiness["ready"]:
+        response.status_code = 503
+    return readiness
+
+
 @app.get("/config")
 def get_config(request: Request):
     return {
         "tasks": list(config.TASKS.keys()),
         "mlflow_tracking_uri": config.MLFLOW_TRACKING_URI,
+        "model_versions": dict(request.app.state.critic.model_versions),
+    }
+
+
+def _feature_row(task_cfg: dict, features: dict) -> list:
+    """Validated tabular feature values in the model's column order."""
+    row = []
+    for k in task_cfg["feature_names"]:
+        value = features.get(k)
+        if value is None:
+            raise KeyError(f"Missing feature: {k}")
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise HTTPException(
+                status_code=422, detail=f"Invalid value for feature '{k}'."
+            )
+        row.append(value)
+    return row
+
+
+def _prompt(features: dict) -> str:
+    prompt = features.get("prompt")
+    if not prompt:
+        raise KeyError("Missing feature: prompt")
+    return prompt
+
+
+async def _solve_prompts(app, task_id, prompts):
+    # The search runs in the task's solver pool, spread over its workers;
+    # the result cache and the solver metrics stay in this process, which
+    # serves and exports them.
+    executors = app.state.executors
+    run = partial(executors.solve, task_id)
+    return await solve_in_executor(run, prompts, executors.solver_workers)
+
+
+def _solver_confidence(answer) -> float:
+    # Critic uses the solver as a "truth" oracle to challenge the proposer:
+    # high confidence when it finds an answer, uncertain otherwise.
+    return 0.9 if answer else 0.5
+
+
+def _contradiction(input_id, task_id, cp0, d, model_version):
+    logger.info(
+        {
+            "event": "contradict",
+            "task_id": task_id,
+            "input_id": input_id,
+            "d": d,
+        }
+    )
+    return {
+        "input_id": input_id,
+        "task_id": task_id,
+        "contradictory": [{"class": "A", "p": cp0}, {"class": "B", "p": 1.0 - cp0}],
+        "critic_version": model_version,
+        "d": d,
     }
 
 
@@ -117,7 +182,7 @@ async def contradict(payload: ContradictPayload, request: Request):
         task_id = payload.task_id or config.DEFAULT_TASK
         task_cfg = config.get_task_config(task_id)
 
-        model = request.app.state.critic.models.get(task_id)
+        model = await request.app.state.critic.ensure_model(task_id)
         model_version = request.app.state.critic.model_versions.get(task_id)
 
         if model is None:
@@ -126,59 +191,27 @@ async def contradict(payload: ContradictPayload, request: Request):
             )
 
         p0 = payload.predictions[0]["p"]
-        ordered_feature_names = task_cfg["feature_names"]
 
         # Handle reasoning tasks (text-based)
         if task_id == "nemotron_reasoning":
-            prompt = payload.features.get("prompt")
-            if not prompt:
-                raise KeyError("Missing feature: prompt")
-
-            # Critic uses the solver as a "truth" oracle to challenge the proposer
-            answer = wonderland_solver(prompt)
-            if answer:
-                # If proposer's confidence was high, let's see if we agree
-                cp0 = 0.9  # High confidence in solver result
-            else:
-                cp0 = 0.5  # Uncertain
-            cp1 = 1.0 - cp0
+            prompt = _prompt(payload.features)
+            [answer] = await _solve_prompts(request.app, task_id, [prompt])
+            cp0 = _solver_confidence(answer)
         else:
-            feature_values = []
-            for k in ordered_feature_names:
-                value = payload.features.get(k)
-                if value is None:
-                    raise KeyError(f"Missing feature: {k}")
-                if not isinstance(value, (int, float)) or not math.isfinite(value):
-                    raise HTTPException(
-                        status_code=422, detail=f"Invalid value for feature '{k}'."
-                    )
-                feature_values.append(value)
-
-            features_array = np.array(feature_values).reshape(1, -1)
-            input_df = pd.DataFrame(features_array, columns=ordered_feature_names)
-
-            critic_probabilities = model.predict(input_df)
-            cp0 = float(critic_probabilities[0])
-            cp1 = 1.0 - cp0
+            row = _feature_row(task_cfg, payload.features)
+            if config.MICROBATCH_ENABLED:
+                # Merged with concurrent requests into one model.predict.
+                cp0 = await request.app.state.batchers.predict(task_id, row)
+            else:
+                critic_probabilities = await request.app.state.executors.infer(
+                    task_id, predict_rows, model, [row], task_cfg["feature_names"]
+                )
+                cp0 = float(critic_probabilities[0])
 
         d = abs(p0 - cp0)
         set_d_value(SERVICE_NAME, d)
-        logger.info(
-            {
-                "event": "contradict",
-                "task_id": task_id,
-                "input_id": payload.input_id,
-                "d": d,
-            }
-        )
-
-        return {
-            "input_id": payload.input_id,
-            "task_id": task_id,
-            "contradictory": [{"class": "A", "p": cp0}, {"class": "B", "p": cp1}],
-            "critic_version": model_version,
-            "d": d,
-        }
+        observe_d_values(SERVICE_NAME, [d])
+        return _contradiction(payload.input_id, task_id, cp0, d, model_version)
     except KeyError as e:
         logger.error(f"Missing feature in payload: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -187,5 +220,91 @@ async def contradict(payload: ContradictPayload, request: Request):
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
 
+def _item_error(payload: ContradictPayload, task_id: str, status_code: int, detail):
+    return {
+        "input_id": payload.input_id,
+        "task_id": task_id,
+        "error": {"status_code": status_code, "detail": detail},
+    }
+
+
+async def _contradict_task_batch(app, task_id, indexed_payloads, results):
+    # One solver batch or one vectorized model.predict for every valid
+    # proposal of the task, then every d at once.
+    model = await app.state.critic.ensure_model(task_id)
+    model_version = app.state.critic.model_versions.get(task_id)
+    if model is None:
+        for i, payload in indexed_payloads:
+            detail = f"Model for task '{task_id}' not loaded."
+            results[i] = _item_error(payload, task_id, 404, detail)
+        return
+
+    task_cfg = config.get_task_config(task_id)
+    reasoning_task = task_id == "nemotron_reasoning"
+    valid, p0s, inputs = [], [], []
+    for i, payload in indexed_payloads:
+        try:
+            p0 = float(payload.predictions[0]["p"])
+            if reasoning_task:
+                inputs.append(_prompt(payload.features))
+            else:
+                inputs.append(_feature_row(task_cfg, payload.features))
+            p0s.append(p0)
+            valid.append((i, payload))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            results[i] = _item_error(payload, task_id, 400, str(e))
+        except HTTPException as e:
+            results[i] = _item_error(payload, task_id, e.status_code, e.detail)
+    if not valid:
+        return
+
+    try:
+        if reasoning_task:
+            answers = await _solve_prompts(app, task_id, inputs)
+            cp0s = np.array([_solver_confidence(answer) for answer in answers])
+        else:
+            feature_names = task_cfg["feature_names"]
+            critic_probabilities = await app.state.executors.infer(
+                task_id, predict_rows, model, inputs, feature_names
+            )
+            cp0s = np.asarray(critic_probabilities, dtype=float)
+    except Exception as e:
+        logger.error(f"Batch critic prediction failed for task '{task_id}': {e}")
+        for i, payload in valid:
+            detail = f"Internal server error: {e}"
+            results[i] = _item_error(payload, task_id, 500, detail)
+        return
+
+    ds = np.abs(np.array(p0s) - cp0s)
+    observe_d_values(SERVICE_NAME, ds)
+    for (i, payload), cp0, d in zip(valid, cp0s.tolist(), ds.tolist()):
+        results[i] = _contradiction(payload.input_id, task_id, cp0, d, model_version)
+
+
+@app.post("/contradict_batch")
+async def contradict_batch(batch: ContradictBatch, request: Request):
+    """Score many proposals, possibly for different tasks, in one call.
+
+    Proposals are grouped by task and each task is scored with one model
+    call. Results come back in input order, each shaped like a
+    ``/contradict`` response or, when that item failed, carrying an
+    ``error`` with its status code. Every ``d`` is recorded in the
+    dissonance histogram.
+    """
+    groups: Dict[str, List] = {}
+    for i, payload in enumerate(batch.items):
+        task_id = payload.task_id or config.DEFAULT_TASK
+        groups.setdefault(task_id, []).append((i, payload))
+
+    results: List[Optional[dict]] = [None] * len(batch.items)
+    await asyncio.gather(
+        *(
+            _contradict_task_batch(request.app, task_id, indexed_payloads, results)
+            for task_id, indexed_payloads in groups.items()
+        )
+    )
+    return {"results": results}
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    serve(app, CriticState(), host="0.0.0.0", port=8000)
@@ -9,20 +9,17 @@ import psycopg2
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from services.common import config
+from services.common.admission import AdmissionController
 from services.common.logging_config import configure_logging
 from services.common.metrics import instrument_request
+from services.common.rate_limit import RateLimiter
 
 configure_logging()
 logger = logging.getLogger("learner")
 SERVICE_NAME = "learner"
 
-limiter = Limiter(key_func=get_remote_address)
-
 
 def get_db_connection():
     return psycopg2.connect(
@@ -73,8 +70,6 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(lifespan=lifespan)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 class UpdatePayload(BaseModel):
@@ -84,8 +79,11 @@ class UpdatePayload(BaseModel):
     task_id: Optional[str] = config.DEFAULT_TASK
 
 
+app.middleware("http")(AdmissionController(SERVICE_NAME).middleware)
+app.middleware("http")(RateLimiter(SERVICE_NAME).middleware)
+
+
 @app.middleware("http")
-@limiter.limit("100/minute")
 async def add_metrics(request: Request, call_next):
     instrument_request(SERVICE_NAME, request.url.path, request.method)
     return await call_next(request)
@@ -4,20 +4,16 @@ import os
 
 import uvicorn
 from fastapi import FastAPI, Request
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from services.common import config
+from services.common.admission import AdmissionController
 from services.common.logging_config import configure_logging
 from services.common.metrics import instrument_request
+from services.common.rate_limit import RateLimiter
 
 configure_logging()
 logger = logging.getLogger("meta-controller")
-limiter = Limiter(key_func=get_remote_address)
 app = FastAPI()
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 SERVICE_NAME = "meta-controller"
 
 
@@ -59,8 +55,11 @@ def _save_policy(policy_data: dict):
 policy = _load_policy()
 
 
+app.middleware("http")(AdmissionController(SERVICE_NAME).middleware)
+app.middleware("http")(RateLimiter(SERVICE_NAME).middleware)
+
+
 @app.middleware("http")
-@limiter.limit("100/minute")
 async def add_metrics(request: Request, call_next):
     instrument_request(SERVICE_NAME, request.url.path, request.method)
     return await call_next(request)
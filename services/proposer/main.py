@@ -1,86 +1,81 @@
+import asyncio
 import logging
 import math
 import os
 import sys
-import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Dict, List, Optional
 
 import mlflow
-import numpy as np
-import pandas as pd
-import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from services.common import config
+from services.common.admission import AdmissionController
+from services.common.batching import ModelBatchers
+from services.common.executors import TaskExecutors
 from services.common.logging_config import configure_logging
 from services.common.metrics import instrument_request
-from services.common.solvers import wonderland_solver
+from services.common.mlp_kernel import predict_rows
+from services.common.model_state import ModelState
+from services.common.model_watcher import ModelWatcher
+from services.common.prefork import serve
+from services.common.rate_limit import RateLimiter
+from services.common.solvers import solve_in_executor
 
 # Configure logging
 configure_logging()
 logger = logging.getLogger("proposer")
 SERVICE_NAME = "proposer"
 
-limiter = Limiter(key_func=get_remote_address)
 
-
-class ProposerState:
+class ProposerState(ModelState):
     def __init__(self):
-        self.models: Dict[str, Any] = {}
-        self.model_versions: Dict[str, str] = {}
-
-    def load_task_model(self, task_id: str):
-        task_cfg = config.get_task_config(task_id)
-        model_name = task_cfg["proposer_model_name"]
-        model_uri = f"models:/{model_name}@production"
-
-        logger.info(f"Attempting to load model for task '{task_id}': {model_uri}")
-
-        for attempt in range(5):
-            try:
-                model = mlflow.pyfunc.load_model(model_uri)
-                self.models[task_id] = model
-                self.model_versions[task_id] = model.metadata.run_id
-                logger.info(
-                    f"Model for task '{task_id}' loaded. Version: {self.model_versions[task_id]}"
-                )
-                return True
-            except Exception as e:
-                logger.warning(
-                    f"Attempt {attempt + 1} failed for task '{task_id}': {e}. Retrying..."
-                )
-                time.sleep(5)
-        return False
+        super().__init__(SERVICE_NAME, "proposer_model_name")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Loads all models from the TASKS config on startup."""
+    """Loads all models from the TASKS config on startup (unless lazy)."""
     mlflow.set_tracking_uri(config.MLFLOW_TRACKING_URI)
-    app.state.proposer = ProposerState()
-
-    success = True
-    for task_id in config.TASKS.keys():
-        if not app.state.proposer.load_task_model(task_id):
-            logger.error(f"CRITICAL: Failed to load model for task '{task_id}'.")
-            success = False
+    # Forked workers reuse the models their parent already loaded.
+    app.state.proposer = getattr(app.state, "preloaded_models", None) or ProposerState()
+    app.state.executors = TaskExecutors()
+    app.state.batchers = ModelBatchers(
+        SERVICE_NAME, app.state.proposer.models, app.state.executors
+    )
+
+    if app.state.proposer.lazy:
+        logger.info("Lazy model loading: tasks load on first use.")
+        success = True
+    else:
+        success = await app.state.proposer.load_all()
 
     if not success and not os.getenv("TEST_MODE"):
         logger.critical("Failed to load required models. Service cannot start.")
         sys.exit(1)
 
+    # Not ready (see /ready) until the solver pool has started, warmed up.
+    warmup = asyncio.create_task(
+        app.state.proposer.warm_up_solvers(app.state.executors)
+    )
+    watcher = None
+    if config.MODEL_RELOAD_INTERVAL_SECONDS > 0:
+        watcher = asyncio.create_task(
+            ModelWatcher(app.state.proposer, "proposer_model_name").run()
+        )
+
     yield
+    warmup.cancel()
+    if watcher is not None:
+        watcher.cancel()
+    await app.state.batchers.close()
+    app.state.executors.shutdown(wait=False)
     app.state.proposer = None
 
 
 app = FastAPI(lifespan=lifespan)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 class Input(BaseModel):
@@ -89,8 +84,15 @@ class Input(BaseModel):
     task_id: Optional[str] = config.DEFAULT_TASK
 
 
+class BatchInput(BaseModel):
+    items: List[Input]
+
+
+app.middleware("http")(AdmissionController(SERVICE_NAME).middleware)
+app.middleware("http")(RateLimiter(SERVICE_NAME).middleware)
+
+
 @app.middleware("http")
-@limiter.limit("100/minute")
 async def add_metrics(request: Request, call_next):
     instrument_request(SERVICE_NAME, request.url.path, request.method)
     return await call_next(request)
@@ -101,11 +103,80 @@ def health(request: Request):
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(request: Request, response: Response):
+    readiness = request.app.state.proposer.readiness()
+    if not readiness["ready"]:
+        response.status_code = 503
+    return readiness
+
+
 @app.get("/config")
 def get_config(request: Request):
     return {
         "tasks": list(config.TASKS.keys()),
         "mlflow_tracking_uri": config.MLFLOW_TRACKING_URI,
+        "model_versions": dict(request.app.state.proposer.model_versions),
+    }
+
+
+def _feature_row(task_cfg: dict, features: dict) -> list:
+    """Validated tabular feature values in the model's column order."""
+    row = []
+    for k in task_cfg["feature_names"]:
+        value = features.get(k)
+        if value is None:
+            raise KeyError(f"Missing feature: {k}")
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise HTTPException(
+                status_code=422, detail=f"Invalid value for feature '{k}'."
+            )
+        row.append(value)
+    return row
+
+
+def _prompt(features: dict) -> str:
+    prompt = features.get("prompt")
+    if not prompt:
+        raise KeyError("Missing feature: prompt")
+    return prompt
+
+
+async def _solve_prompts(app, task_id, prompts):
+    # The search runs in the task's solver pool, spread over its workers;
+    # the result cache and the solver metrics stay in this process, which
+    # serves and exports them.
+    executors = app.state.executors
+    run = partial(executors.solve, task_id)
+    return await solve_in_executor(run, prompts, executors.solver_workers)
+
+
+def _solver_prediction(answer):
+    """(reasoning, p0) for a Wonderland solver answer."""
+    if answer:
+        reasoning = f"Based on the Wonderland rules, the answer is \\boxed{{{answer}}}"
+        return reasoning, 0.95  # High confidence when solver works
+    reasoning = "The transformation rule is complex, but I predict a baseline value."
+    return reasoning, 0.5
+
+
+def _prediction(input_id, task_id, p0, reasoning, model_version):
+    p1 = 1.0 - p0
+    logger.info(
+        {
+            "event": "predict",
+            "task_id": task_id,
+            "input_id": input_id,
+            "p0": p0,
+            "p1": p1,
+        }
+    )
+    return {
+        "input_id": input_id,
+        "task_id": task_id,
+        "predictions": [{"class": "A", "p": p0}, {"class": "B", "p": p1}],
+        "reasoning": reasoning,
+        "model_version": model_version,
     }
 
 
@@ -115,7 +186,7 @@ async def predict(item: Input, request: Request):
         task_id = item.task_id or config.DEFAULT_TASK
         task_cfg = config.get_task_config(task_id)
 
-        model = request.app.state.proposer.models.get(task_id)
+        model = await request.app.state.proposer.ensure_model(task_id)
         model_version = request.app.state.proposer.model_versions.get(task_id)
 
         if model is None:
@@ -123,62 +194,26 @@ async def predict(item: Input, request: Request):
                 status_code=404, detail=f"Model for task '{task_id}' not loaded."
             )
 
-        ordered_feature_names = task_cfg["feature_names"]
-        reasoning = None
-
         # Handle reasoning tasks (text-based)
         if task_id == "nemotron_reasoning":
-            prompt = item.features.get("prompt")
-            if not prompt:
-                raise KeyError("Missing feature: prompt")
-
-            # Use wonderland_solver for real reasoning
-            answer = wonderland_solver(prompt)
-            if answer:
-                reasoning = (
-                    f"Based on the Wonderland rules, the answer is \\boxed{{{answer}}}"
-                )
-                p0 = 0.95  # High confidence when solver works
-            else:
-                reasoning = "The transformation rule is complex, but I predict a baseline value."
-                p0 = 0.5
-            p1 = 1.0 - p0
+            prompt = _prompt(item.features)
+
+            # Use the Wonderland solvers for real reasoning
+            [answer] = await _solve_prompts(request.app, task_id, [prompt])
+            reasoning, p0 = _solver_prediction(answer)
         else:
-            feature_values = []
-            for k in ordered_feature_names:
-                value = item.features.get(k)
-                if value is None:
-                    raise KeyError(f"Missing feature: {k}")
-                if not isinstance(value, (int, float)) or not math.isfinite(value):
-                    raise HTTPException(
-                        status_code=422, detail=f"Invalid value for feature '{k}'."
-                    )
-                feature_values.append(value)
-
-            features_array = np.array(feature_values).reshape(1, -1)
-            input_df = pd.DataFrame(features_array, columns=ordered_feature_names)
-
-            probabilities = model.predict(input_df)
-            p0 = float(probabilities[0])
-            p1 = 1.0 - p0
-
-        logger.info(
-            {
-                "event": "predict",
-                "task_id": task_id,
-                "input_id": item.input_id,
-                "p0": p0,
-                "p1": p1,
-            }
-        )
+            reasoning = None
+            row = _feature_row(task_cfg, item.features)
+            if config.MICROBATCH_ENABLED:
+                # Merged with concurrent requests into one model.predict.
+                p0 = await request.app.state.batchers.predict(task_id, row)
+            else:
+                probabilities = await request.app.state.executors.infer(
+                    task_id, predict_rows, model, [row], task_cfg["feature_names"]
+                )
+                p0 = float(probabilities[0])
 
-        return {
-            "input_id": item.input_id,
-            "task_id": task_id,
-            "predictions": [{"class": "A", "p": p0}, {"class": "B", "p": p1}],
-            "reasoning": reasoning,
-            "model_version": model_version,
-        }
+        return _prediction(item.input_id, task_id, p0, reasoning, model_version)
     except KeyError as e:
         logger.error(f"Missing feature in payload: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -187,5 +222,84 @@ async def predict(item: Input, request: Request):
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
 
+def _item_error(item: Input, task_id: str, status_code: int, detail: str):
+    return {
+        "input_id": item.input_id,
+        "task_id": task_id,
+        "error": {"status_code": status_code, "detail": detail},
+    }
+
+
+async def _predict_task_batch(app, task_id, indexed_items, results):
+    # One solver batch or one vectorized model.predict for every valid item
+    # of the task; invalid items get their own error entry.
+    model = await app.state.proposer.ensure_model(task_id)
+    model_version = app.state.proposer.model_versions.get(task_id)
+    if model is None:
+        for i, item in indexed_items:
+            detail = f"Model for task '{task_id}' not loaded."
+            results[i] = _item_error(item, task_id, 404, detail)
+        return
+
+    task_cfg = config.get_task_config(task_id)
+    reasoning_task = task_id == "nemotron_reasoning"
+    valid, inputs = [], []
+    for i, item in indexed_items:
+        try:
+            if reasoning_task:
+                inputs.append(_prompt(item.features))
+            else:
+                inputs.append(_feature_row(task_cfg, item.features))
+            valid.append((i, item))
+        except KeyError as e:
+            results[i] = _item_error(item, task_id, 400, str(e))
+        except HTTPException as e:
+            results[i] = _item_error(item, task_id, e.status_code, e.detail)
+    if not valid:
+        return
+
+    try:
+        if reasoning_task:
+            answers = await _solve_prompts(app, task_id, inputs)
+            scored = [_solver_prediction(answer) for answer in answers]
+        else:
+            feature_names = task_cfg["feature_names"]
+            probabilities = await app.state.executors.infer(
+                task_id, predict_rows, model, inputs, feature_names
+            )
+            scored = [(None, float(p)) for p in probabilities]
+    except Exception as e:
+        logger.error(f"Batch prediction failed for task '{task_id}': {e}")
+        for i, item in valid:
+            detail = f"Internal server error: {e}"
+            results[i] = _item_error(item, task_id, 500, detail)
+        return
+
+    for (i, item), (reasoning, p0) in zip(valid, scored):
+        results[i] = _prediction(item.input_id, task_id, p0, reasoning, model_version)
+
+
+@app.post("/predict_batch")
+async def predict_batch(batch: BatchInput, request: Request):
+    """Predict many inputs, possibly for different tasks, in one call.
+
+    Items are grouped by task and each task is predicted in one go. Results
+    come back in input order, each shaped like a ``/predict`` response or,
+    when that item failed, carrying an ``error`` with its status code.
+    """
+    groups: Dict[str, List] = {}
+    for i, item in enumerate(batch.items):
+        groups.setdefault(item.task_id or config.DEFAULT_TASK, []).append((i, item))
+
+    results: List[Optional[dict]] = [None] * len(batch.items)
+    await asyncio.gather(
+        *(
+            _predict_task_batch(request.app, task_id, indexed_items, results)
+            for task_id, indexed_items in groups.items()
+        )
+    )
+    return {"results": results}
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    serve(app, ProposerState(), host="0.0.0.0", port=8000)
@@ -3,20 +3,16 @@ import logging
 import uvicorn
 from fastapi import FastAPI, Request
 from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from services.common import config
+from services.common.admission import AdmissionController
 from services.common.logging_config import configure_logging
 from services.common.metrics import instrument_request
+from services.common.rate_limit import RateLimiter
 
 configure_logging()
 logger = logging.getLogger("safety-gate")
-limiter = Limiter(key_func=get_remote_address)
 app = FastAPI()
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 SERVICE_NAME = "safety-gate"
 
 
@@ -27,8 +23,11 @@ class Contradiction(BaseModel):
     d: float
 
 
+app.middleware("http")(AdmissionController(SERVICE_NAME).middleware)
+app.middleware("http")(RateLimiter(SERVICE_NAME).middleware)
+
+
 @app.middleware("http")
-@limiter.limit("100/minute")
 async def add_metrics(request: Request, call_next):
     instrument_request(SERVICE_NAME, request.url.path, request.method)
     return await call_next(request)
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.admission import AdmissionController  # noqa: E402
+
+
+def test_finished_request_hands_its_slot_to_the_oldest_waiter():
+    async def scenario():
+        admission = AdmissionController(
+            "test", max_in_flight=1, max_queue=1, queue_timeout_ms=1000
+        )
+        assert await admission.acquire("/predict") is True
+        waiting = asyncio.create_task(admission.acquire("/predict"))
+        await asyncio.sleep(0)
+        # The route is busy and its queue is full: shed.
+        assert await admission.acquire("/predict") is False
+        # Other routes are bounded separately.
+        assert await admission.acquire("/contradict") is True
+
+        admission.release("/predict")
+        assert await waiting is True
+        admission.release("/predict")
+        admission.release("/contradict")
+        return admission._routes["/predict"]
+
+    route = asyncio.run(scenario())
+    assert route.in_flight == 0
+    assert not route.waiters
+
+
+def test_queued_request_is_shed_after_the_timeout():
+    async def scenario():
+        admission = AdmissionController(
+            "test", max_in_flight=1, max_queue=4, queue_timeout_ms=10
+        )
+        assert await admission.acquire("/predict") is True
+        assert await admission.acquire("/predict") is False
+        route = admission._routes["/predict"]
+        assert route.in_flight == 1
+        assert not route.waiters
+        admission.release("/predict")
+        assert route.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_route_limits_override_the_default():
+    async def scenario():
+        admission = AdmissionController(
+            "test", max_in_flight=1, max_queue=0, routes={"/predict": 3}
+        )
+        results = [await admission.acquire("/predict") for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    asyncio.run(scenario())
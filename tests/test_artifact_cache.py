@@ -0,0 +1,97 @@
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.artifact_cache import ModelArtifactCache  # noqa: E402
+
+
+def _version(run_id, version="1"):
+    return SimpleNamespace(
+        run_id=run_id, version=version, source=f"s3://mlflow/1/{run_id}/model"
+    )
+
+
+def _fake_download(payload=b"weights"):
+    # Like MLflow for a models:/ URI: files land directly in dst_path.
+    def download(artifact_uri, dst_path):
+        with open(os.path.join(dst_path, "model.pkl"), "wb") as f:
+            f.write(payload)
+        return dst_path
+
+    return download
+
+
+def test_second_fetch_is_served_from_disk(tmp_path):
+    cache = ModelArtifactCache(str(tmp_path))
+    with patch(
+        "mlflow.artifacts.download_artifacts", side_effect=_fake_download()
+    ) as download:
+        first = cache.fetch("proposer-diabetes", _version("run-1"))
+        second = cache.fetch("proposer-diabetes", _version("run-1"))
+    assert first == second
+    assert download.call_count == 1
+    assert download.call_args[1]["artifact_uri"] == "models:/proposer-diabetes/1"
+    with open(os.path.join(first, "model.pkl"), "rb") as f:
+        assert f.read() == b"weights"
+
+
+def test_corrupt_entry_is_downloaded_again(tmp_path):
+    cache = ModelArtifactCache(str(tmp_path))
+    with patch(
+        "mlflow.artifacts.download_artifacts", side_effect=_fake_download()
+    ) as download:
+        path = cache.fetch("proposer-diabetes", _version("run-1"))
+        with open(os.path.join(path, "model.pkl"), "wb") as f:
+            f.write(b"truncated")
+        path = cache.fetch("proposer-diabetes", _version("run-1"))
+    assert download.call_count == 2
+    with open(os.path.join(path, "model.pkl"), "rb") as f:
+        assert f.read() == b"weights"
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ModelArtifactCache(str(tmp_path), max_bytes=300)
+    payload = b"x" * 60
+    with patch(
+        "mlflow.artifacts.download_artifacts", side_effect=_fake_download(payload)
+    ):
+        old = cache.fetch("proposer-diabetes", _version("run-1"))
+        os.utime(os.path.join(os.path.dirname(old), "SHA256"), (0, 0))
+        cache.fetch("proposer-diabetes", _version("run-2", "2"))
+        cache.fetch("proposer-diabetes", _version("run-3", "3"))
+    assert not os.path.exists(old)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_load_from_a_real_registry(tmp_path):
+    """Round-trip through MLflow's own download, not a stand-in."""
+    import mlflow
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+
+    previous_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    try:
+        client = mlflow.tracking.MlflowClient()
+        experiment_id = client.create_experiment(
+            "cache-test", artifact_location=(tmp_path / "artifacts").as_uri()
+        )
+        X = np.arange(12, dtype=float).reshape(6, 2)
+        model = LogisticRegression().fit(X, [0, 1] * 3)
+        with mlflow.start_run(experiment_id=experiment_id):
+            mlflow.sklearn.log_model(
+                model, name="model", registered_model_name="proposer-test"
+            )
+        client.set_registered_model_alias("proposer-test", "production", "1")
+
+        cache = ModelArtifactCache(str(tmp_path / "cache"))
+        first = cache.load("proposer-test")
+        second = cache.load("proposer-test")
+    finally:
+        mlflow.set_tracking_uri(previous_uri)
+    assert first.metadata.run_id == second.metadata.run_id
+    assert len(os.listdir(tmp_path / "cache")) == 1
@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.batching import MicroBatcher  # noqa: E402
+
+
+def test_micro_batcher_merges_concurrent_calls():
+    """Concurrent submits share one run_batch call and get their own results."""
+    batches = []
+
+    async def run_batch(items):
+        batches.append(list(items))
+        await asyncio.sleep(0.01)
+        return [item * 10 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher("test", "task", run_batch, max_batch_size=8)
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.close()
+        return results
+
+    assert asyncio.run(scenario()) == [0, 10, 20, 30, 40]
+    assert len(batches) < 5
+    assert sorted(item for batch in batches for item in batch) == list(range(5))
+
+
+def test_micro_batcher_propagates_errors_to_callers():
+    async def run_batch(items):
+        raise RuntimeError("model failed")
+
+    async def scenario():
+        batcher = MicroBatcher("test", "task", run_batch)
+        try:
+            await batcher.submit(1)
+        finally:
+            await batcher.close()
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        asyncio.run(scenario())
@@ -44,3 +44,34 @@ def test_contradict_endpoint_with_model(client):
     response = client.post("/contradict", json=payload)
     assert response.status_code == 200
     assert response.json()["contradictory"][0]["p"] == 0.3
+
+
+def test_contradict_batch_endpoint(client):
+    """One model call scores the batch; d is computed per proposal."""
+    mock_model = client.app.state.critic.models["diabetes"]
+    mock_model.predict.return_value = [0.3, 0.5]
+    mock_model.predict.reset_mock()  # forget the warm-up predictions
+    task_cfg = config.get_task_config("diabetes")
+    features = {name: 0.0 for name in task_cfg["feature_names"]}
+
+    def proposal(input_id, p, features):
+        return {
+            "input_id": input_id,
+            "task_id": "diabetes",
+            "predictions": [{"class": "A", "p": p}],
+            "model_version": "proposer-v1",
+            "features": features,
+        }
+
+    items = [
+        proposal("a", 0.8, features),
+        proposal("bad", 0.8, {}),
+        proposal("b", 0.25, features),
+    ]
+    response = client.post("/contradict_batch", json={"items": items})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["d"] == pytest.approx(0.5)
+    assert results[1]["error"]["status_code"] == 400
+    assert results[2]["d"] == pytest.approx(0.25)
+    assert mock_model.predict.call_count == 1
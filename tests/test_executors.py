@@ -0,0 +1,53 @@
+import asyncio
+import os
+import signal
+import sys
+import threading
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.executors import TaskExecutors  # noqa: E402
+
+
+def test_tasks_get_separate_executors():
+    """A task whose solver workers are all blocked does not delay another task."""
+    executors = TaskExecutors(solver_kind="thread", solver_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(
+            executors.solve("nemotron_reasoning", release.wait, 5)
+        )
+        answer = await asyncio.wait_for(
+            executors.infer("diabetes", lambda x: x * 2, 21), timeout=2
+        )
+        assert not blocked.done()
+        release.set()
+        assert await blocked is True
+        return answer
+
+    try:
+        assert asyncio.run(scenario()) == 42
+        assert executors.get("diabetes", "inference") is not executors.get(
+            "heart_failure", "inference"
+        )
+    finally:
+        release.set()
+        executors.shutdown()
+
+
+def test_broken_solver_pool_is_replaced():
+    """A killed solver process does not break later solves for the task."""
+    executors = TaskExecutors(solver_kind="process", solver_workers=1)
+
+    async def scenario():
+        worker = await executors.solve("nemotron_reasoning", os.getpid)
+        os.kill(worker, signal.SIGKILL)
+        return worker, await executors.solve("nemotron_reasoning", os.getpid)
+
+    try:
+        worker, replacement = asyncio.run(scenario())
+        assert replacement not in (worker, os.getpid())
+    finally:
+        executors.shutdown()
@@ -0,0 +1,60 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+from sklearn.neural_network import MLPClassifier
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.mlp_kernel import (  # noqa: E402
+    KernelModel,
+    MLPKernel,
+    fast_model,
+    predict_rows,
+)
+
+
+def _fitted_mlp(activation="relu"):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 5)), columns=list("abcde"))
+    y = (X["a"] + X["b"] * X["c"] > 0).astype(int)
+    model = MLPClassifier(
+        hidden_layer_sizes=(16, 8),
+        activation=activation,
+        max_iter=300,
+        random_state=42,
+    )
+    return model.fit(X, y), X
+
+
+def test_kernel_matches_predict_proba():
+    for activation in ("relu", "tanh", "logistic"):
+        model, X = _fitted_mlp(activation)
+        kernel = MLPKernel.from_sklearn(model)
+        expected = model.predict_proba(X)[:, 1]
+        np.testing.assert_allclose(kernel.predict_proba(X), expected, atol=1e-5)
+        np.testing.assert_allclose(
+            kernel.predict_proba(X.iloc[0].tolist()), expected[:1], atol=1e-5
+        )
+
+
+def test_fast_model_wraps_mlp_and_falls_back_otherwise():
+    model, X = _fitted_mlp()
+    pyfunc_model = MagicMock()
+    pyfunc_model.get_raw_model.return_value = model
+    fast = fast_model(pyfunc_model)
+    assert isinstance(fast, KernelModel)
+    assert fast.metadata is pyfunc_model.metadata
+    rows = X.head(3).values.tolist()
+    np.testing.assert_allclose(
+        predict_rows(fast, rows, list(X.columns)),
+        model.predict_proba(X.head(3))[:, 1],
+        atol=1e-5,
+    )
+
+    other = MagicMock()
+    other.get_raw_model.return_value = object()
+    assert fast_model(other) is other
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common import config  # noqa: E402
+from services.common.executors import TaskExecutors  # noqa: E402
+from services.common.model_state import ModelState  # noqa: E402
+
+
+@patch("mlflow.pyfunc.load_model")
+def test_load_all_loads_and_warms_every_task(mock_load, monkeypatch):
+    monkeypatch.setattr(config, "SOLVER_WARMUP", False)
+    mock_load.return_value.metadata.run_id = "run-1"
+    state = ModelState("proposer", "proposer_model_name", lazy=False)
+    assert state.readiness()["ready"] is False
+
+    assert asyncio.run(state.load_all()) is True
+    assert mock_load.call_count == len(config.TASKS)
+    assert set(state.models) == set(config.TASKS)
+    assert mock_load.return_value.predict.called
+    assert state.readiness()["ready"] is False
+
+    asyncio.run(state.warm_up_solvers(None))
+    assert state.readiness()["ready"] is True
+
+
+def test_solver_warm_up_runs_in_solver_pool():
+    state = ModelState("proposer", "proposer_model_name", lazy=True)
+    executors = TaskExecutors(solver_kind="thread", solver_workers=1)
+    try:
+        asyncio.run(state.warm_up_solvers(executors))
+    finally:
+        executors.shutdown()
+    assert state.solver_state == "loaded"
+    assert state.readiness()["ready"] is True
+
+
+@patch("mlflow.pyfunc.load_model")
+def test_lazy_state_loads_task_on_first_use(mock_load, monkeypatch):
+    """Only the requested task loads, once, however many callers race for it."""
+    mock_load.return_value.metadata.run_id = "run-1"
+    state = ModelState("proposer", "proposer_model_name", lazy=True)
+
+    async def first_requests():
+        return await asyncio.gather(*(state.ensure_model("diabetes") for _ in range(3)))
+
+    models = asyncio.run(first_requests())
+    assert all(model is mock_load.return_value for model in models)
+    mock_load.assert_called_once_with("models:/proposer-diabetes@production")
+    assert state.load_states["diabetes"] == "loaded"
+
+
+@patch("mlflow.pyfunc.load_model", side_effect=OSError("registry down"))
+def test_failed_load_is_reported(mock_load, monkeypatch):
+    monkeypatch.setattr(config, "MODEL_LOAD_ATTEMPTS", 2)
+    monkeypatch.setattr(config, "MODEL_LOAD_BACKOFF_SECONDS", 0)
+    state = ModelState("critic", "critic_model_name", lazy=False)
+
+    assert asyncio.run(state.ensure_loaded("diabetes")) is False
+    assert mock_load.call_count == 2
+    assert state.load_states["diabetes"] == "failed"
+    assert state.readiness()["ready"] is False
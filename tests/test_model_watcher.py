@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.model_watcher import ModelWatcher  # noqa: E402
+
+
+def _state(run_id):
+    old_model = MagicMock()
+    old_model.metadata.run_id = run_id
+    return SimpleNamespace(
+        models={"diabetes": old_model}, model_versions={"diabetes": run_id}
+    )
+
+
+@patch("mlflow.pyfunc.load_model")
+@patch("mlflow.tracking.MlflowClient")
+def test_watcher_swaps_model_when_alias_moves(mock_client, mock_load):
+    """A new production run is loaded, warmed and swapped in."""
+    state = _state("run-1")
+    old_model = state.models["diabetes"]
+    mock_client.return_value.get_model_version_by_alias.return_value = SimpleNamespace(
+        run_id="run-2", version="2"
+    )
+    mock_load.return_value.metadata.run_id = "run-2"
+
+    watcher = ModelWatcher(state, "proposer_model_name", interval=0)
+    assert asyncio.run(watcher.check("diabetes")) is True
+    mock_load.assert_called_once_with("models:/proposer-diabetes/2")
+    assert mock_load.return_value.predict.called
+    assert state.models["diabetes"] is mock_load.return_value
+    assert state.model_versions["diabetes"] == "run-2"
+    assert state.models["diabetes"] is not old_model
+
+
+@patch("mlflow.pyfunc.load_model")
+@patch("mlflow.tracking.MlflowClient")
+def test_watcher_keeps_model_when_alias_unchanged(mock_client, mock_load):
+    state = _state("run-1")
+    mock_client.return_value.get_model_version_by_alias.return_value = SimpleNamespace(
+        run_id="run-1", version="1"
+    )
+    watcher = ModelWatcher(state, "proposer_model_name", interval=0)
+    assert asyncio.run(watcher.check("diabetes")) is False
+    mock_load.assert_not_called()
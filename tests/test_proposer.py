@@ -1,6 +1,8 @@
+import asyncio
 import importlib  # noqa: F401  # noqa: F401
 import os
 import sys
+import time
 from unittest.mock import patch
 
 import pytest
@@ -26,11 +28,72 @@ def client():
             yield test_client
 
 
+def test_worker_reuses_preloaded_models():
+    """A forked worker's lifespan serves its parent's models without reloading."""
+    os.environ["TEST_MODE"] = "1"
+    with patch("mlflow.pyfunc.load_model") as mock_load_model:
+        mock_load_model.return_value.metadata.run_id = "test-run-id"
+        from services.proposer.main import ProposerState, app  # noqa: E402
+
+        state = ProposerState()
+        asyncio.run(state.load_all())
+        state.after_fork()
+        loads = mock_load_model.call_count
+        app.state.preloaded_models = state
+        try:
+            with TestClient(app):
+                assert app.state.proposer is state
+                assert mock_load_model.call_count == loads
+        finally:
+            del app.state.preloaded_models
+
+
 def test_health_endpoint(client):
     response = client.get("/health")
     assert response.status_code == 200
 
 
+def test_config_reports_model_versions(client):
+    response = client.get("/config")
+    assert response.status_code == 200
+    assert response.json()["model_versions"]["diabetes"] == "test-run-id"
+
+
+def test_ready_endpoint(client):
+    """Ready once the models are loaded and the solver pool has warmed up."""
+    deadline = time.monotonic() + 60
+    response = client.get("/ready")
+    while response.json()["solver"] in ("pending", "loading"):
+        assert time.monotonic() < deadline, "solver warm-up did not finish"
+        time.sleep(0.1)
+        response = client.get("/ready")
+    body = response.json()
+    assert body["tasks"]["diabetes"] == "loaded"
+    assert body["solver"] == "loaded"
+    assert response.status_code == 200
+
+
+def test_not_ready_while_solvers_warm_up():
+    os.environ["TEST_MODE"] = "1"
+    release = asyncio.Event()
+
+    async def pending_warm_up(self, executors):
+        self.solver_state = "loading"
+        await release.wait()
+
+    with patch("mlflow.pyfunc.load_model") as mock_load_model, patch(
+        "services.common.model_state.ModelState.warm_up_solvers", pending_warm_up
+    ):
+        mock_load_model.return_value.metadata.run_id = "test-run-id"
+        from services.proposer.main import app  # noqa: E402
+
+        with TestClient(app) as test_client:
+            response = test_client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["solver"] == "loading"
+    assert response.json()["ready"] is False
+
+
 def test_predict_endpoint(client):
     # Retrieve the mock model that was loaded during lifespan
     mock_model = client.app.state.proposer.models["diabetes"]
@@ -41,3 +104,26 @@ def test_predict_endpoint(client):
     response = client.post("/predict", json=payload)
     assert response.status_code == 200
     assert response.json()["predictions"][0]["p"] == 0.8
+
+
+def test_predict_batch_endpoint(client):
+    """Items are predicted per task in one call; a bad item fails on its own."""
+    mock_model = client.app.state.proposer.models["diabetes"]
+    mock_model.predict.return_value = [0.8, 0.3]
+    mock_model.predict.reset_mock()  # forget the warm-up predictions
+    task_cfg = config.get_task_config("diabetes")
+    features = {name: 0.0 for name in task_cfg["feature_names"]}
+    items = [
+        {"input_id": "a", "task_id": "diabetes", "features": features},
+        {"input_id": "bad", "task_id": "diabetes", "features": {}},
+        {"input_id": "b", "task_id": "diabetes", "features": features},
+    ]
+    response = client.post("/predict_batch", json={"items": items})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["input_id"] for r in results] == ["a", "bad", "b"]
+    assert results[0]["predictions"][0]["p"] == 0.8
+    assert results[1]["error"]["status_code"] == 400
+    assert results[2]["predictions"][0]["p"] == 0.3
+    assert mock_model.predict.call_count == 1
+    assert len(mock_model.predict.call_args[0][0]) == 2
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.rate_limit import RateLimiter, parse_rate  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("100/minute") == (100, 60)
+    assert parse_rate("5/seconds") == (5, 1)
+    with pytest.raises(ValueError):
+        parse_rate("10/fortnight")
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = RateLimiter("test", default="2/second", exempt=[], clock=clock)
+    assert limiter.check("/predict", "1.2.3.4") == 0
+    assert limiter.check("/predict", "1.2.3.4") == 0
+    assert limiter.check("/predict", "1.2.3.4") == pytest.approx(0.5)
+    # Other clients and other routes have buckets of their own.
+    assert limiter.check("/predict", "5.6.7.8") == 0
+    assert limiter.check("/contradict", "1.2.3.4") == 0
+
+    clock.now = 0.5
+    assert limiter.check("/predict", "1.2.3.4") == 0
+
+
+def test_route_and_client_quotas_and_exempt_networks():
+    limiter = RateLimiter(
+        "test",
+        default="1/minute",
+        routes={"/predict": "3/minute"},
+        clients={"1.2.3.4": "2/minute"},
+        exempt=["10.0.0.0/8"],
+        clock=FakeClock(),
+    )
+    assert sum(limiter.check("/predict", "5.6.7.8") == 0 for _ in range(5)) == 3
+    assert sum(limiter.check("/predict", "1.2.3.4") == 0 for _ in range(5)) == 2
+    assert sum(limiter.check("/update", "5.6.7.8") == 0 for _ in range(5)) == 1
+    assert all(limiter.check("/predict", "10.1.2.3") == 0 for _ in range(100))
+
+
+def test_rejection_is_a_429_with_retry_after():
+    app = FastAPI()
+    limiter = RateLimiter("test", default="1/minute", exempt=[])
+    app.middleware("http")(limiter.middleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"status": "ok"}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    client = TestClient(app)
+    assert client.get("/ping").status_code == 200
+    response = client.get("/ping")
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 60
+    assert all(client.get("/health").status_code == 200 for _ in range(3))
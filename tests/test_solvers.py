@@ -0,0 +1,445 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from services.common import config  # noqa: E402
+from services.common import solvers as solvers_module  # noqa: E402
+from services.common.solver_cache import SolverCache  # noqa: E402
+from services.common.solvers import (  # noqa: E402
+    WARMUP_PROMPTS,
+    Puzzle,
+    WordPatternIndex,
+    classify_prompt,
+    decode_cipher_words,
+    get_byte_programs,
+    get_solver_cache,
+    parse_puzzle,
+    solve_batch,
+    solve_bits,
+    solve_equations,
+    solve_in_executor,
+    solve_symbolic_equation,
+    solve_text,
+    solve_uncached,
+    solve_with_status,
+    warm_up_solvers,
+    wonderland_solver,
+    word_pattern,
+)
+
+BITS_HEADER = (
+    "In Alice's Wonderland, a secret bit manipulation rule transforms 8-bit "
+    "binary numbers.\n\nHere are some examples of input -> output:\n"
+)
+
+TEXT_PROMPT = (
+    "In Alice's Wonderland, secret encryption rules are used on text. "
+    "Here are some examples:\n"
+    "ucoov pwgtfyoqg vorq yrjjoe -> queen discovers near valley\n"
+    "pqrsfv pqorzg wvgwpo trgbjo -> dragon dreams inside castle\n"
+    "gbcpovb tqorbog bxo zrswtrj pffq -> student creates the magical door\n"
+    "bxo sfjpov pqrsfv dfjjfig -> the golden dragon follows\n"
+    "nqwvtogg qorpg bxo zegboqwfcg gotqob -> princess reads the mysterious secret\n"
+    "Now, decrypt the following text: trb wzrswvog hffk"
+)
+
+EQUATIONS_HEADER = (
+    "In Alice's Wonderland, a secret set of transformation rules is applied "
+    "to equations. Below are a few examples:\n"
+)
+
+
+def _bits_prompt(rule, inputs, target):
+    lines = [f"{x:08b} -> {rule(x):08b}" for x in inputs]
+    return (
+        BITS_HEADER
+        + "\n".join(lines)
+        + f"\n\nNow, determine the output for: {target:08b}"
+    )
+
+
+def test_solve_bits_global_rotation():
+    """A whole-byte rotation is recognised before the per-column search."""
+    prompt = _bits_prompt(lambda x: ((x << 3) | (x >> 5)) & 0xFF, [1, 6, 77, 200], 0x93)
+    assert solve_bits(prompt) == f"{((0x93 << 3) | (0x93 >> 5)) & 0xFF:08b}"
+
+
+def test_solve_bits_per_column_xor(monkeypatch):
+    """Columns that are parities of input bits are solved by the XOR stage."""
+
+    def rule(x):
+        # Four XOR-ed terms: beyond the byte programs' three primitives.
+        return x ^ (x >> 1) ^ (((x << 3) | (x >> 5)) & 0xFF) ^ ((x << 5) & 0xFF)
+
+    def hits(stage):
+        labels = {"category": "bits", "stage": stage}
+        return REGISTRY.get_sample_value("solver_stage_hits_total", labels) or 0
+
+    monkeypatch.setattr(config, "SOLVER_TRACING", True)
+    inputs = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x5A]
+    before = hits("byte_program"), hits("xor")
+    assert solve_bits(_bits_prompt(rule, inputs, 0xC3)) == f"{rule(0xC3):08b}"
+    assert (hits("byte_program"), hits("xor")) == (before[0], before[1] + 1)
+
+
+def test_solve_bits_whole_byte_program():
+    """Composed byte programs (here a choice function) match as a whole."""
+
+    def rule(x):
+        rot = ((x << 1) | (x >> 7)) & 0xFF
+        return (x & rot) | (~x & (x >> 2)) & 0xFF
+
+    inputs = [0x00, 0x13, 0x2C, 0x55, 0x8F, 0xB4, 0xE1, 0xFF]
+    assert solve_bits(_bits_prompt(rule, inputs, 0x6A)) == f"{rule(0x6A):08b}"
+
+
+def test_byte_program_cache_roundtrip(tmp_path, monkeypatch):
+    cache_file = tmp_path / "byte_programs.npz"
+    monkeypatch.setattr(config, "BYTE_PROGRAMS_CACHE_PATH", str(cache_file))
+    names, table = get_byte_programs.__wrapped__()
+    assert table.shape == (len(names), 256)
+    assert cache_file.exists()
+    cached_names, cached_table = get_byte_programs.__wrapped__()
+    assert cached_names == names
+    assert np.array_equal(cached_table, table)
+
+    # A file from another solver version is rebuilt, not trusted.
+    np.savez(cache_file, version="0", names=np.array(names[:1]), table=table[:1])
+    rebuilt_names, rebuilt_table = get_byte_programs.__wrapped__()
+    assert rebuilt_names == names
+    with np.load(cache_file) as rewritten:
+        assert str(rewritten["version"]) == solvers_module.SOLVER_VERSION
+        assert len(rewritten["table"]) == len(table)
+
+
+def test_solve_bits_requires_target():
+    assert solve_bits(BITS_HEADER + "00000001 -> 00000010") is None
+
+
+def test_word_pattern():
+    assert word_pattern("queen") == "abccd"
+    assert word_pattern("door") == word_pattern("book") == "abbc"
+
+
+def test_word_pattern_index_filters_by_known_letters():
+    index = WordPatternIndex(["book", "door", "cool", "cat"])
+    assert index.matches("hffk", {}) == ["book", "cool", "door"]
+    assert index.matches("hffk", {"k": "l"}) == ["cool"]
+    assert index.matches("hffk", {"h": {"d", "x"}}) == ["door"]
+    assert index.matches("hffk", {"h": "z"}) == []
+    assert index.matches("hfgk", {}) == []
+
+
+def test_decode_cipher_words_keeps_mapping_bijective():
+    index = WordPatternIndex(["book", "door", "cat"])
+    # 'door' would need h -> d, but 'd' already belongs to cipher letter 'p'.
+    char_map = {"f": "o", "p": "d"}
+    assert decode_cipher_words(["hffk"], char_map, [index]) == ["book"]
+
+
+def test_decode_cipher_words_solves_words_jointly():
+    index = WordPatternIndex(["cat", "cut", "tub"])
+    # 'cat' is tried first for the first word but leaves nothing for the
+    # second one; the solver backtracks to 'cut' so that 'tub' fits.
+    assert decode_cipher_words(["xyz", "zyw"], {}, [index]) == ["cut", "tub"]
+
+
+def test_decode_cipher_words_spells_out_fully_mapped_words():
+    char_map = {"q": "o", "r": "w", "s": "l"}
+    assert decode_cipher_words(["qrs", "qzs"], char_map, []) == ["owl", "qzs"]
+
+
+def test_solve_text_decodes_with_dictionary():
+    assert solve_text(TEXT_PROMPT) == "cat imagines book"
+
+
+def test_solve_equations_plain_arithmetic():
+    prompt = (
+        EQUATIONS_HEADER + "12+30 = 42\n51+7 = 58\nNow, determine the result for: 20+22"
+    )
+    assert solve_equations(prompt) == "42"
+
+
+def test_solve_equations_reversed_operands():
+    """Digits are reversed on the way in and out: 28*71 -> rev(82 * 17)."""
+    prompt = EQUATIONS_HEADER + (
+        "28*71 = 4931\n13*39 = 3882\n57*67 = 0075\n"
+        "Now, determine the result for: 42*31"
+    )
+    assert solve_equations(prompt) == str(24 * 13)[::-1]
+
+
+def test_solve_equations_operator_marks_negative_results():
+    prompt = EQUATIONS_HEADER + (
+        "12-30 = -18\n51-7 = 44\nNow, determine the result for: 20-62"
+    )
+    assert solve_equations(prompt) == "-42"
+    prompt = EQUATIONS_HEADER + (
+        "12`30 = `18\n51`7 = 44\nNow, determine the result for: 20`62"
+    )
+    assert solve_equations(prompt) == "`42"
+
+
+def test_solve_equations_beyond_int64():
+    """Operands and results past int64 are solved exactly, not overflowed."""
+    prompt = EQUATIONS_HEADER + (
+        "3000000000*4000000000 = 12000000000000000000\n2*3 = 6\n"
+        "Now, determine the result for: 5000000000*6000000000"
+    )
+    assert solve_equations(prompt) == "30000000000000000000"
+    prompt = EQUATIONS_HEADER + (
+        "1+2 = 3\n5+7 = 12\nNow, determine the result for: 99999999999999999999+1"
+    )
+    assert solve_equations(prompt) == str(10**20)
+
+
+SYMBOLS = dict(zip("0123456789", "!@#$%^&*()"))
+
+
+def _encode(text):
+    return "".join(SYMBOLS.get(ch, ch) for ch in text)
+
+
+def test_solve_symbolic_equation_infers_digits_and_operator():
+    """'{' hides addition and digits are written as punctuation."""
+    pairs = [(12, 34), (56, 27), (83, 19), (45, 90), (67, 71)]
+    examples = [
+        (_encode(f"{a:02d}") + "{" + _encode(f"{b:02d}"), _encode(str(a + b)))
+        for a, b in pairs
+    ]
+    target = _encode("38") + "{" + _encode("25")
+    assert solve_symbolic_equation(examples, target, time_budget=1.0) == _encode("63")
+
+
+def test_solve_symbolic_equation_gives_up_without_examples_for_operator():
+    examples = [(_encode("12") + "{" + _encode("34"), _encode("46"))]
+    assert (
+        solve_symbolic_equation(examples, _encode("12") + "]" + _encode("34")) is None
+    )
+
+
+def test_solve_symbolic_equation_respects_time_budget():
+    examples = [(_encode("12") + "{" + _encode("34"), _encode("46"))]
+    target = _encode("38") + "{" + _encode("25")
+    assert solve_symbolic_equation(examples, target, time_budget=0.0) is None
+
+
+def test_symbolic_search_timeout_reports_budget_exhausted(monkeypatch):
+    """A cryptarithm search cut short by its own budget is not a clean solve."""
+    monkeypatch.setattr(config, "CRYPTARITHM_TIME_BUDGET_SECONDS", 0.0)
+    prompt = EQUATIONS_HEADER + (
+        _encode("12") + "{" + _encode("34") + " = " + _encode("46") + "\n"
+        "Now, determine the result for: " + _encode("38") + "{" + _encode("25")
+    )
+    answer, status = solve_with_status(prompt)
+    assert status == "budget_exhausted"
+    assert get_solver_cache().get(prompt, "missing") == "missing"
+
+
+def test_parse_puzzle_classifies_and_extracts_once():
+    """A prompt is classified and its examples and target extracted up front."""
+    puzzle = parse_puzzle(TEXT_PROMPT)
+    assert isinstance(puzzle, Puzzle)
+    assert puzzle.category == "text"
+    assert puzzle.examples[0] == (
+        "ucoov pwgtfyoqg vorq yrjjoe",
+        "queen discovers near valley",
+    )
+    assert puzzle.target == "trb wzrswvog hffk"
+    assert solve_text(puzzle) == "cat imagines book"
+
+
+def test_parse_puzzle_numeric_arrays():
+    """Bit and measurement examples are parsed straight into arrays."""
+    puzzle = parse_puzzle(_bits_prompt(lambda x: x ^ 0xFF, [1, 2, 3], 0x0F))
+    assert puzzle.category == "bits"
+    assert puzzle.arrays["inputs"].shape == (3, 8)
+    assert puzzle.arrays["target"].tolist() == [0, 0, 0, 0, 1, 1, 1, 1]
+
+    puzzle = parse_puzzle(
+        "In Alice's Wonderland, a secret unit conversion is applied to measurements. "
+        "For example:\n10.00 m becomes 5.00\n4.00 m becomes 2.00\n"
+        "Now, convert the following measurement: 7.00 m"
+    )
+    assert puzzle.arrays["inputs"].tolist() == [10.0, 4.0]
+    assert wonderland_solver(puzzle) == "3.50"
+
+
+def test_warm_up_prompts_cover_every_category():
+    categories = {classify_prompt(prompt) for prompt in WARMUP_PROMPTS}
+    assert categories == set(config.SOLVER_TIME_BUDGETS)
+    assert warm_up_solvers() == len(WARMUP_PROMPTS)
+
+
+def test_classify_prompt_unknown():
+    assert classify_prompt("What is the capital of France?") is None
+
+
+def test_classify_prompt_follows_dispatch_order():
+    """A higher-priority keyword wins even when a lower one comes first."""
+    prompt = (
+        "This bit manipulation rule is applied to equations, "
+        "and the gravitational constant has changed."
+    )
+    assert classify_prompt(prompt) == "physics"
+    assert classify_prompt(prompt.replace("gravitational", "")) == "equations"
+    assert wonderland_solver("What is the capital of France?") is None
+
+
+def test_solve_batch_keeps_input_order():
+    """Batches are grouped by category for the workers but answered in order."""
+    bits = _bits_prompt(lambda x: x ^ 0xFF, [1, 2, 3, 200], 0x0F)
+    prompts = [bits, TEXT_PROMPT, "unknown", bits, TEXT_PROMPT]
+    expected = ["11110000", "cat imagines book", None, "11110000", "cat imagines book"]
+    assert solve_batch(prompts, workers=1) == expected
+    assert solve_batch(prompts, workers=2, chunksize=1) == expected
+
+
+def test_solve_batch_isolates_a_failing_prompt(monkeypatch):
+    """A prompt whose solver raises is unsolved; the rest of the batch is not."""
+    bits = _bits_prompt(lambda x: x ^ 0x0F, [1, 2, 3, 77], 0xF0)
+
+    def fail(puzzle, deadline=None):
+        raise OverflowError("boom")
+
+    monkeypatch.setitem(solvers_module._SOLVERS, "bits", fail)
+    answers = solve_batch([TEXT_PROMPT, bits, TEXT_PROMPT], workers=1)
+    assert answers == ["cat imagines book", None, "cat imagines book"]
+    assert get_solver_cache().get(bits, "missing") == "missing"
+
+
+def test_solve_batch_lazy_iterator():
+    answers = solve_batch([TEXT_PROMPT] * 3, workers=1, lazy=True)
+    assert not isinstance(answers, list)
+    assert list(answers) == ["cat imagines book"] * 3
+
+
+def test_solver_cache_two_tiers(tmp_path):
+    """Answers, including None, survive LRU eviction via the SQLite store."""
+    path = str(tmp_path / "answers.db")
+    cache = SolverCache("v1", maxsize=1, path=path)
+    cache.put("a", "1")
+    cache.put("b", None)
+    assert len(cache) == 1
+    assert cache.get("a") == "1"
+    assert cache.get("b", "missing") is None
+    assert cache.get("c", "missing") == "missing"
+
+    assert SolverCache("v1", path=path).get("a") == "1"
+    assert SolverCache("v2", path=path).get("a", "missing") == "missing"
+
+
+def test_wonderland_solver_uses_result_cache():
+    cache = get_solver_cache()
+    cache.put(TEXT_PROMPT, "cached answer")
+    try:
+        assert wonderland_solver(TEXT_PROMPT) == "cached answer"
+        assert solve_batch([TEXT_PROMPT], workers=1) == ["cached answer"]
+    finally:
+        cache.clear()
+
+
+def test_solve_with_status_reports_exhausted_budget():
+    """An expired budget returns the greedy partial decode, uncached."""
+    prompt = TEXT_PROMPT.replace("trb wzrswvog hffk", "hffk trb")
+    answer, status = solve_with_status(prompt, time_budget=-1.0)
+    assert status == "budget_exhausted"
+    assert len(answer.split()) == 2
+    assert get_solver_cache().get(prompt, "missing") == "missing"
+    assert solve_with_status(prompt)[1] == "solved"
+
+
+def test_solve_uncached_bypasses_result_cache():
+    cache = get_solver_cache()
+    cache.put(TEXT_PROMPT, "stale answer")
+    try:
+        assert solve_uncached(TEXT_PROMPT) == ("cat imagines book", "solved")
+        assert cache.get(TEXT_PROMPT) == "stale answer"
+    finally:
+        cache.clear()
+
+
+def test_stage_tracing_records_matching_stage(monkeypatch):
+    """With tracing on, the stage that answered is counted as a hit."""
+    labels = {"category": "bits", "stage": "rotation"}
+
+    def hits():
+        return REGISTRY.get_sample_value("solver_stage_hits_total", labels) or 0
+
+    prompt = _bits_prompt(lambda x: ((x << 3) | (x >> 5)) & 0xFF, [1, 6, 77, 200], 0x93)
+    before = hits()
+    solve_bits(prompt)
+    assert hits() == before
+
+    monkeypatch.setattr(config, "SOLVER_TRACING", True)
+    solve_bits(prompt)
+    assert hits() == before + 1
+    assert REGISTRY.get_sample_value("solver_stage_duration_seconds_count", labels)
+
+
+def test_solve_in_executor_records_metrics_in_the_caller(monkeypatch):
+    """A solve in a spawned pool is cached and traced in the calling process."""
+    monkeypatch.setenv("SOLVER_TRACING", "true")
+    monkeypatch.setattr(config, "SOLVER_TRACING", False)
+    labels = {"category": "bits", "stage": "rotation"}
+
+    def hits():
+        return REGISTRY.get_sample_value("solver_stage_hits_total", labels) or 0
+
+    prompt = _bits_prompt(lambda x: ((x << 3) | (x >> 5)) & 0xFF, [1, 6, 77, 200], 0x93)
+    expected = f"{((0x93 << 3) | (0x93 >> 5)) & 0xFF:08b}"
+    cache = get_solver_cache()
+    before = hits()
+    pool = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+
+    async def run(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    try:
+        answers = asyncio.run(solve_in_executor(run, [prompt, TEXT_PROMPT, prompt]))
+        assert answers == [expected, "cat imagines book", expected]
+        assert cache.get(prompt) == expected
+        assert hits() == before + 2
+    finally:
+        pool.shutdown()
+        cache.clear()
+
+
+def test_solve_in_executor_spreads_misses_over_workers():
+    """Uncached prompts go out as concurrent chunks, one per worker."""
+
+    def rotate(x):
+        return ((x << 3) | (x >> 5)) & 0xFF
+
+    targets = [0x11, 0x22, 0x33, 0x44]
+    prompts = [_bits_prompt(rotate, [1, 6, 77, 200], t) for t in targets]
+    prompts.insert(2, TEXT_PROMPT)
+    payloads, in_flight, peak = [], 0, 0
+
+    async def run(fn, *args):
+        nonlocal in_flight, peak
+        payloads.append(args[0])
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return fn(*args)
+
+    cache = get_solver_cache()
+    try:
+        answers = asyncio.run(solve_in_executor(run, prompts, workers=2))
+    finally:
+        cache.clear()
+    expected = [f"{rotate(t):08b}" for t in targets]
+    expected.insert(2, "cat imagines book")
+    assert answers == expected
+    assert sorted(len(payload) for payload in payloads) == [2, 3]
+    assert peak == 2